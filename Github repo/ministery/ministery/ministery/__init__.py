@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The response cache and storage modules live at the repository root and are
+# shared with the other scrapers
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
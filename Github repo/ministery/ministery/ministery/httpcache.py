@@ -0,0 +1,62 @@
+# Scrapy HTTP cache storage backed by the shared on-disk response cache
+#
+# See documentation in:
+# https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
+
+import time
+
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+
+from cache import ResponseCache
+
+
+class ResponseCacheStorage:
+    """Stores responses in a ResponseCache so every scraper shares one layout.
+
+    Entries are always handed back to the cache policy. Their Cache-Control
+    header is rewritten from the per-class TTL, so RFC2616Policy serves fresh
+    entries from disk and revalidates stale ones with ETag/Last-Modified.
+    """
+
+    def __init__(self, settings):
+        self.cache_dir = settings.get("HTTPCACHE_DIR")
+        self.ttls = settings.getdict("HTTPCACHE_TTLS")
+        self.url_class = settings.get("HTTPCACHE_URL_CLASS", "detail")
+        self.cache = None
+
+    def open_spider(self, spider):
+        self.cache = ResponseCache(self.cache_dir, self.ttls)
+        spider.logger.debug(f"Using response cache in {self.cache_dir}")
+
+    def close_spider(self, spider):
+        pass
+
+    def retrieve_response(self, spider, request):
+        cached = self.cache.get(request.url)
+        if cached is None:
+            return None
+
+        headers = Headers(cached.headers)
+        headers.pop("Age", None)
+        headers["Cache-Control"] = f"max-age={self.cache.ttls[self.url_class]}"
+        headers["Date"] = time.strftime(
+            "%a, %d %b %Y %H:%M:%S GMT", time.gmtime(cached.fetched_at)
+        )
+
+        respcls = responsetypes.from_args(
+            headers=headers, url=cached.url, body=cached.content
+        )
+        return respcls(
+            url=cached.url,
+            headers=headers,
+            status=cached.status_code,
+            body=cached.content,
+        )
+
+    def store_response(self, spider, request, response):
+        headers = {
+            key.decode("latin-1"): b", ".join(values).decode("latin-1")
+            for key, values in response.headers.items()
+        }
+        self.cache.store(request.url, response.status, headers, response.body)
@@ -7,7 +7,34 @@
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 
+from storage import Storage
+
 
 class MinisteryPipeline:
     def process_item(self, item, spider):
         return item
+
+
+class StoragePipeline:
+    """Upserts the scraped ministers into the shared SQLite database"""
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.storage = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.settings.get("STORAGE_DB", "moroccan_parliament.sqlite"))
+
+    def open_spider(self, spider):
+        self.storage = Storage(self.db_file)
+
+    def close_spider(self, spider):
+        self.storage.close()
+
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        # The spider also yields links between governments, which are not ministers
+        if adapter.get("name"):
+            self.storage.write("ministers", adapter.asdict())
+        return item
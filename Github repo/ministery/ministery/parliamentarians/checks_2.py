@@ -1,5 +1,10 @@
+import argparse
+import hashlib
 import json
 
+import ijson
+
+
 def are_json_files_equal(file1, file2):
     """
     Compares two JSON files for equality.
@@ -27,11 +32,156 @@ def are_json_files_equal(file1, file2):
         print(f"Error while comparing JSON files: {e}")
         return False
 
+
+def iter_records(filename):
+    """
+    Streams (category, record) pairs from a JSON or JSONL file.
+
+    Handles a top-level array of records (category None), an object of
+    {category: [records]} like the legislation dumps, and .jsonl files
+    (category None, or the category of sink-style {"category", "record"}
+    lines). Only one record is held in memory at a time.
+    """
+    with open(filename, "rb") as f:
+        if filename.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    if set(entry) == {"category", "record"}:
+                        yield entry["category"], entry["record"]
+                    else:
+                        yield None, entry
+            return
+
+        builder = None
+        depth = 0
+        category = None
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is None:
+                # Records are the objects of a top-level array, or of the
+                # arrays held by the top-level object
+                if event == "start_map" and (prefix == "item" or (prefix.endswith(".item") and prefix.count(".") == 1)):
+                    builder = ijson.ObjectBuilder()
+                    category = None if prefix == "item" else prefix[: -len(".item")]
+                else:
+                    continue
+
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+                if depth == 0:
+                    yield category, builder.value
+                    builder = None
+
+
+def get_record_key(category, record, key_fields):
+    """The "category" key field is the array the record was found in."""
+    return tuple(
+        category if field == "category" else record.get(field) for field in key_fields
+    )
+
+
+def fingerprint(record):
+    return hashlib.sha1(
+        json.dumps(record, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).digest()
+
+
+def index_records(filename, key_fields, keep=None):
+    """
+    Maps each record key of a file to a fingerprint of the record.
+
+    A key that repeats within a file gets an occurrence number so duplicates
+    are compared in order instead of overwriting each other. Records whose
+    key is in keep are returned in full as well.
+    """
+    index = {}
+    kept = {}
+    occurrences = {}
+    for category, record in iter_records(filename):
+        key = get_record_key(category, record, key_fields)
+        occurrence = occurrences.get(key, 0)
+        occurrences[key] = occurrence + 1
+        if occurrence:
+            key = (*key, occurrence)
+
+        index[key] = fingerprint(record)
+        if keep is not None and key in keep:
+            kept[key] = record
+    return index, kept
+
+
+def diff_fields(old, new):
+    """Returns {field: {"old": value, "new": value}} for every field that differs."""
+    changes = {}
+    for field in list(old) + [field for field in new if field not in old]:
+        if old.get(field) != new.get(field):
+            changes[field] = {"old": old.get(field), "new": new.get(field)}
+    return changes
+
+
+def diff_json_files(old_file, new_file, key_fields=("url",)):
+    """
+    Compares two crawls record by record, matched on key_fields.
+
+    Both files are streamed. Memory holds a key index of each file plus the
+    records that changed, never the full documents. Returns a dict with the
+    keys of added and removed records and the field-level changes of the
+    changed ones.
+    """
+    old_index, _ = index_records(old_file, key_fields)
+
+    # First pass over the new file: find which keys are new or changed
+    new_index, _ = index_records(new_file, key_fields)
+    added = [key for key in new_index if key not in old_index]
+    removed = [key for key in old_index if key not in new_index]
+    changed_keys = {
+        key for key, digest in new_index.items() if key in old_index and old_index[key] != digest
+    }
+    del old_index, new_index
+
+    # Second pass: only the changed records are loaded to diff their fields
+    _, old_records = index_records(old_file, key_fields, keep=changed_keys)
+    _, new_records = index_records(new_file, key_fields, keep=changed_keys)
+    changed = [
+        {"key": list(key), "changes": diff_fields(old_records[key], new_records[key])}
+        for key in sorted(changed_keys, key=str)
+    ]
+
+    return {
+        "key_fields": list(key_fields),
+        "added": [list(key) for key in added],
+        "removed": [list(key) for key in removed],
+        "changed": changed,
+    }
+
+
 # Example usage
 if __name__ == "__main__":
-    file1 = "parliamentarians_arabic_2011_2016.json"
-    file2 = "parliamentarians_arabic_2016_2021.json"
-    if are_json_files_equal(file1, file2):
-        print("The two JSON files are equal.")
-    else:
-        print("The two JSON files are not equal.")
+    parser = argparse.ArgumentParser(description="Compare two crawls record by record")
+    parser.add_argument("old_file")
+    parser.add_argument("new_file")
+    parser.add_argument(
+        "--key",
+        nargs="+",
+        default=["url"],
+        help="Fields identifying a record, e.g. url (or category url) for laws "
+        "and name term for deputies",
+    )
+    parser.add_argument("--output", help="Write the full diff to this JSON file")
+    args = parser.parse_args()
+
+    diff = diff_json_files(args.old_file, args.new_file, args.key)
+    print(
+        f"{len(diff['added'])} added, {len(diff['removed'])} removed, "
+        f"{len(diff['changed'])} changed records (key: {', '.join(args.key)})"
+    )
+    for change in diff["changed"][:20]:
+        print(f"  {change['key']}: {', '.join(change['changes'])}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(diff, f, ensure_ascii=False, indent=2)
+        print(f"Diff saved to {args.output}")
@@ -1,2 +1,12 @@
 ANNUARY_URL = "https://www.chambredesrepresentants.ma/fr/annuaire-parlementaire"
 
+DIRECTORY_URL_AR = "https://www.chambredesrepresentants.ma/ar/%D8%AF%D9%84%D9%8A%D9%84-%D8%A3%D8%B9%D8%B6%D8%A7%D8%A1-%D9%85%D8%AC%D9%84%D8%B3-%D8%A7%D9%84%D9%86%D9%88%D8%A7%D8%A8"
+
+# Legislative terms crawled in one run
+TERMS = ["2011-2016", "2016-2021", "2021-2026"]
+
+# Directory URL of each language, {term} is replaced by the term
+DIRECTORY_URLS = {
+    "ar": f"{DIRECTORY_URL_AR}/{{term}}/",
+    "fr": f"{ANNUARY_URL}/{{term}}",
+}
@@ -1,5 +1,205 @@
+import argparse
 import json
 import os
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+
+import ijson
+
+
+def parse_value(text):
+    """Reads a command line value as JSON when it is valid JSON, else as a string."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def build_transform(spec):
+    """
+    Builds a record -> record function from a declared transform.
+
+    Transforms are declared as tuples so they can be sent to other processes:
+        ("add", field, value)       set field to value
+        ("rename", old, new)        rename a field
+        ("drop", field)             remove a field
+        ("map", field, mapping)     replace the values found in mapping (keyed by str(value))
+        ("filter", field, values)   keep only records whose field is in values
+    A transform returns None to drop the record.
+    """
+    kind, *args = spec
+    if kind == "add":
+        field, value = args
+        return lambda record: {**record, field: value}
+    if kind == "rename":
+        old, new = args
+        return lambda record: {
+            (new if key == old else key): value for key, value in record.items()
+        }
+    if kind == "drop":
+        (field,) = args
+        return lambda record: {key: value for key, value in record.items() if key != field}
+    if kind == "map":
+        field, mapping = args
+        return lambda record: (
+            {**record, field: mapping.get(str(record[field]), record[field])}
+            if isinstance(record.get(field), (str, int, float, bool)) and field in record
+            else record
+        )
+    if kind == "filter":
+        field, values = args
+        return lambda record: record if record.get(field) in values else None
+    raise ValueError(f"Unknown transform: {kind}")
+
+
+def apply_transforms(record, transforms):
+    for transform in transforms:
+        record = transform(record)
+        if record is None:
+            return None
+    return record
+
+
+def iter_document(f):
+    """
+    Streams a JSON document as ("start_map"/"start_array", key),
+    ("record", key, item), ("end_map"/"end_array", key) and
+    ("value", key, value) events, key being None at the top level.
+
+    Records are the items of a top-level array (key None) or of the arrays
+    held by a top-level object, so only one record is in memory at a time.
+    Other members of a top-level object are read whole as values.
+    """
+    builder = None
+    depth = 0
+    kind = None
+    key = None
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+                if depth == 0:
+                    yield kind, key, builder.value
+                    builder = None
+            continue
+
+        if prefix == "":
+            if event == "map_key":
+                key = value
+            elif event in ("start_map", "end_map", "start_array", "end_array"):
+                yield event, None, None
+            continue
+
+        container = "item" if key is None else f"{key}.item"
+        if prefix == key and event in ("start_array", "end_array"):
+            yield event, key, None
+        elif prefix in (key, container):
+            kind = "value" if prefix == key else "record"
+            if event in ("start_map", "start_array"):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                depth = 1
+            else:
+                yield kind, key, value
+
+
+def dump_indented(value, level):
+    """Lays a value out like json.dump(..., indent=2) would at a nesting level."""
+    return textwrap.indent(json.dumps(value, ensure_ascii=False, indent=2), "  " * level)[2 * level:]
+
+
+def transform_json(f, out, transforms):
+    """
+    Streams a JSON array, or an object holding arrays, writing the
+    transformed records with the same layout as json.dump(..., indent=2).
+    """
+    count = 0
+    level = 1
+    first_key = True
+    first_item = True
+    for kind, key, value in iter_document(f):
+        if kind == "start_map":
+            # Items of the arrays of a top-level object sit one level deeper
+            out.write("{")
+            level = 2
+        elif kind == "end_map":
+            out.write("}" if first_key else "\n}")
+        elif kind == "value":
+            out.write("\n" if first_key else ",\n")
+            out.write(f"  {json.dumps(key, ensure_ascii=False)}: {dump_indented(value, 1)}")
+            first_key = False
+        elif kind == "start_array":
+            if key is not None:
+                out.write("\n" if first_key else ",\n")
+                out.write(f"  {json.dumps(key, ensure_ascii=False)}: [")
+                first_key = False
+            else:
+                out.write("[")
+            first_item = True
+        elif kind == "record":
+            record = apply_transforms(value, transforms) if isinstance(value, dict) else value
+            if record is None:
+                continue
+            out.write("\n" if first_item else ",\n")
+            out.write(textwrap.indent(json.dumps(record, ensure_ascii=False, indent=2), "  " * level))
+            first_item = False
+            count += 1
+        elif kind == "end_array":
+            out.write("]" if first_item else "\n" + "  " * (level - 1) + "]")
+    return count
+
+
+def transform_jsonl(f, out, transforms):
+    """Streams a JSONL file line by line, sink-style {"category", "record"} lines included."""
+    count = 0
+    for line in f:
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        if isinstance(entry, dict) and set(entry) == {"category", "record"}:
+            record = apply_transforms(entry["record"], transforms)
+            entry = None if record is None else {**entry, "record": record}
+        else:
+            entry = apply_transforms(entry, transforms)
+        if entry is not None:
+            out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def transform_file(input_file, output_file, specs):
+    """
+    Applies a chain of declared transforms to every record of a file.
+
+    The input is read incrementally and the output written to a temporary
+    file that replaces output_file only once complete, so output_file may be
+    the input itself. Returns the number of records written.
+    """
+    transforms = [build_transform(spec) for spec in specs]
+    temp_file = f"{output_file}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as out:
+        if input_file.endswith(".jsonl"):
+            with open(input_file, "r", encoding="utf-8") as f:
+                count = transform_jsonl(f, out, transforms)
+        else:
+            with open(input_file, "rb") as f:
+                count = transform_json(f, out, transforms)
+    os.replace(temp_file, output_file)
+    return count
+
+
+def transform_files(jobs, specs, workers=4):
+    """Transforms several (input_file, output_file) pairs in parallel processes."""
+    jobs = list(jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        counts = executor.map(
+            transform_file, [job[0] for job in jobs], [job[1] for job in jobs], [specs] * len(jobs)
+        )
+        return dict(zip((job[1] for job in jobs), counts))
+
 
 def add_term_as_attribute(filename, start_year="2011", end_year="2016"):
     """
@@ -15,25 +215,88 @@ def add_term_as_attribute(filename, start_year="2011", end_year="2016"):
         if not os.path.exists(filename):
             print(f"Error: File '{filename}' does not exist.")
             return
-        
-        # Read the JSON file
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        # Add the new attribute 'term' to each entry
+
+        # Stream the entries, adding the new attribute 'term' to each one
         term = f"{start_year}-{end_year}"
-        for entry in data:
-            entry["term"] = term
-        
-        # Save the updated data back to the file
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
-        print(f"Successfully added 'term' attribute to {len(data)} entries in '{filename}'.")
-    
+        count = transform_file(filename, filename, [("add", "term", term)])
+
+        print(f"Successfully added 'term' attribute to {count} entries in '{filename}'.")
+
     except Exception as e:
         print(f"Error while processing the file: {e}")
 
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Apply a chain of transforms to the records of JSON or JSONL files"
+    )
+    parser.add_argument("files", nargs="+")
+    # Every transform option appends (kind, argument) to one list, so the
+    # transforms run in the order they are given
+    parser.add_argument(
+        "--add", dest="transforms", action="append", default=[], metavar="FIELD=VALUE",
+        type=lambda option: ("add", option),
+    )
+    parser.add_argument(
+        "--rename", dest="transforms", action="append", metavar="OLD=NEW",
+        type=lambda option: ("rename", option),
+    )
+    parser.add_argument(
+        "--drop", dest="transforms", action="append", metavar="FIELD",
+        type=lambda option: ("drop", option),
+    )
+    parser.add_argument(
+        "--map", dest="transforms", action="append", metavar="FIELD=MAPPING.json",
+        type=lambda option: ("map", option),
+        help="Replace the values of a field using a JSON object of old -> new values",
+    )
+    parser.add_argument(
+        "--keep", dest="transforms", action="append", metavar="FIELD=VALUE",
+        type=lambda option: ("filter", option),
+        help="Keep only records whose field equals one of the given values",
+    )
+    parser.add_argument("--suffix", default=".transformed", help="Added before the extension of each output file")
+    parser.add_argument("--in-place", action="store_true")
+    parser.add_argument("--workers", type=int, default=4)
+    return parser.parse_args()
+
+
+def build_specs(args):
+    """Turns the command line options into declared transforms, in the order given.
+
+    Consecutive --keep options on the same field form one filter that keeps
+    any of their values.
+    """
+    specs = []
+    for kind, option in args.transforms:
+        if kind == "drop":
+            specs.append(("drop", option))
+            continue
+        field, value = option.split("=", 1)
+        if kind == "filter":
+            if specs and specs[-1][:2] == ("filter", field):
+                specs[-1][2].append(parse_value(value))
+            else:
+                specs.append(("filter", field, [parse_value(value)]))
+        elif kind == "rename":
+            specs.append(("rename", field, value))
+        elif kind == "map":
+            with open(value, "r", encoding="utf-8") as f:
+                specs.append(("map", field, json.load(f)))
+        else:
+            specs.append(("add", field, parse_value(value)))
+    return specs
+
+
 # Example usage
 if __name__ == "__main__":
-    add_term_as_attribute("parliamentarians_arabic.json")
+    args = parse_args()
+    specs = build_specs(args)
+
+    jobs = []
+    for filename in args.files:
+        root, extension = os.path.splitext(filename)
+        jobs.append((filename, filename if args.in_place else f"{root}{args.suffix}{extension}"))
+
+    for output_file, count in transform_files(jobs, specs, args.workers).items():
+        print(f"Wrote {count} records to '{output_file}'.")
@@ -1,25 +1,45 @@
-import json
-from scraper import GeneralizedParliamentScraper
-from config import ANNUARY_URL
+import argparse
+import repo_path  # noqa: F401
+from scraper import GeneralizedParliamentScraperArabic
+from cache import ResponseCache
+from storage import Storage
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape the parliamentarians directory")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip pages completed by the previous run and continue from its checkpoint",
+    )
+    parser.add_argument(
+        "--db",
+        nargs="?",
+        const="moroccan_parliament.sqlite",
+        help="Also upsert the deputies into a SQLite database",
+    )
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+
     # Create scraper instance
-    scraper = GeneralizedParliamentScraper(ANNUARY_URL)
+    scraper = GeneralizedParliamentScraperArabic(
+        cache=ResponseCache(".http_cache"),
+        storage=Storage(args.db) if args.db else None,
+    )
 
     try:
-        # Start scraping parliamentarians
-        results = scraper.scrape()
+        # Start scraping every term in both languages
+        results = scraper.scrape(resume=args.resume, output_file="parliamentarians.json")
         print(f"Scraped {len(results)} parliamentarians successfully")
-        
-        # Save results to a JSON file
-        with open("parliamentarians.json", "w", encoding="utf-8") as f:
-            json.dump(results, f, ensure_ascii=False, indent=4)
         print("Results saved to parliamentarians.json")
     except Exception as e:
         print(f"Error during scraping: {str(e)}")
     finally:
         # Cleanup resources, like closing the browser
         scraper.cleanup()
+        if scraper.storage is not None:
+            scraper.storage.close()
 
 if __name__ == "__main__":
     main()
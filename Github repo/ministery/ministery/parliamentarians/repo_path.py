@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The crawl building blocks (response cache, checkpoint journal, rate
+# scheduler, driver pool, storage, utils) live at the repository root and are
+# shared by every scraper. The root is appended, so this directory's own
+# modules (config_2) still take precedence.
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
@@ -1,37 +1,78 @@
 import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
 import json
 import logging
 import time
 import random
 from fake_useragent import UserAgent
 import atexit
+import lxml.html
+import repo_path  # noqa: F401
+from cache import ResponseCache
+import os
+from utils import (
+    extract_fields,
+    extract_fields_from_tree,
+    wait_until_ready,
+    add_lean_options,
+    enable_resource_blocking,
+    get_page_stats,
+    measure_blocking_savings,
+    format_blocking_savings,
+)
+from checkpoint import CheckpointJournal
+from scheduler import RateScheduler
+from driver_pool import DriverPool
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs
+import threading
+from config_2 import DIRECTORY_URLS, TERMS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+# Declarative field spec for a directory card, see utils.extract_fields
+PARLIAMENTARIAN_CARD_SELECTOR = "div.filter-result-wrp > div.f-result-list.row > div"
+
+PARLIAMENTARIAN_FIELDS = {
+    "name": {"css": "span.q-name > a"},
+    "party": {"css": "span:nth-child(2)"},
+    "function": {"css": "a:nth-child(3) > span"},
+}
+
 class GeneralizedParliamentScraperArabic:
-    def __init__(self, base_url):
-        self.base_url = base_url
-        self.driver = None
+    def __init__(self, directory_urls=None, terms=None, cache=None, scheduler=None, lean_browser=True, user_data_dir=".browser_profile", pool_size=4, storage=None):
+        # {language: directory URL with a {term} placeholder}
+        self.directory_urls = directory_urls if directory_urls is not None else DIRECTORY_URLS
+        self.terms = terms if terms is not None else TERMS
+        self.pool_size = pool_size
+        self.lean_browser = lean_browser
+        self.user_data_dir = user_data_dir
+        self.cache = cache
+        self.storage = storage
+        self.scheduler = scheduler if scheduler is not None else RateScheduler()
+        self.journal = None
+        self.driver_pool = None
+        self.driver_pool_lock = threading.Lock()
+        # Resource blocking is measured against a baseline load on the first page
+        self.blocking_measured = False
+        self.blocking_measured_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
         atexit.register(self.cleanup)  # Ensure cleanup after scraping
 
     def cleanup(self):
         """Safely cleanup driver resources"""
-        if self.driver:
+        if self.journal is not None:
+            self.journal.close()
+        if self.driver_pool is not None:
             self.logger.info("Cleaning up driver resources...")
             try:
-                self.driver.quit()
+                self.driver_pool.close()
             except Exception as e:
                 self.logger.error(f"Error during cleanup: {str(e)}")
-            self.driver = None
+            self.driver_pool = None
 
-    def get_driver(self):
-        """Initialize and return an undetected Chrome driver"""
+    def get_driver(self, slot=0):
+        """Initialize and return an undetected Chrome driver (one profile dir per pool slot)"""
         try:
             options = uc.ChromeOptions()
             ua = UserAgent()
@@ -52,77 +93,137 @@ class GeneralizedParliamentScraperArabic:
             random_size = random.choice(window_sizes)
             options.add_argument(f"--window-size={random_size[0]},{random_size[1]}")
 
+            # Headless, no extensions, no background traffic, warm profile
+            if self.lean_browser:
+                add_lean_options(options, os.path.abspath(os.path.join(self.user_data_dir, str(slot))))
+
             driver = uc.Chrome(options=options)
             driver.set_page_load_timeout(random.randint(30, 40))
 
+            if self.lean_browser:
+                enable_resource_blocking(driver)
+
             return driver
         except Exception as e:
             self.logger.error(f"Failed to initialize driver: {str(e)}")
             raise
 
-    def wait_for_element(self, by, value, timeout=30):
-        """Wait until the element is visible on the page."""
-        WebDriverWait(self.driver, timeout).until(EC.visibility_of_element_located((by, value)))
+    def get_driver_pool(self):
+        """Return the browser pool, launching it on first use"""
+        with self.driver_pool_lock:
+            if self.driver_pool is None:
+                self.driver_pool = DriverPool(self.get_driver, self.pool_size).start()
+            return self.driver_pool
 
-    def extract_parliamentarians_from_page(self):
-        """Dynamically extracts all entries for parliamentarians on the current page (Arabic version)."""
-        parliamentarians = []
-        try:
-            self.wait_for_element(By.CSS_SELECTOR, "div.filter-result-wrp")
-            
-            # Extract all parliamentarian cards on the page
-            parliamentarian_cards = self.driver.find_elements(By.CSS_SELECTOR, "div.filter-result-wrp > div.f-result-list.row > div")
+    def extract_parliamentarians_from_page(self, driver):
+        """Dynamically extracts all entries for parliamentarians on the driver's current page (Arabic version).
 
-            if not parliamentarian_cards:
-                self.logger.warning("No parliamentarian cards found on the page.")
+        Readiness timeouts and extraction errors are raised so the page is not
+        recorded as completed.
+        """
+        # Continue as soon as the cards are rendered and stable
+        wait_until_ready(driver, "directory", timeout=30)
 
-            # Loop through all the cards and extract details
-            for card in parliamentarian_cards:
-                try:
-                    # Extract the name
-                    name_element = card.find_element(By.CSS_SELECTOR, "span.q-name > a")
-                    name = name_element.text.strip()
+        # Read every card in a single round trip to the browser
+        cards = extract_fields(
+            driver, PARLIAMENTARIAN_CARD_SELECTOR, PARLIAMENTARIAN_FIELDS
+        )
+        return self.keep_complete_cards(cards)
 
-                    # Extract the party
-                    party_element = card.find_element(By.CSS_SELECTOR, "span:nth-child(2)")
-                    party = party_element.text.strip()
+    def extract_parliamentarians_from_html(self, html):
+        """Extracts all parliamentarians from a cached copy of a directory page."""
+        tree = lxml.html.fromstring(html)
+        cards = extract_fields_from_tree(
+            tree, PARLIAMENTARIAN_CARD_SELECTOR, PARLIAMENTARIAN_FIELDS
+        )
+        return self.keep_complete_cards(cards)
 
-                    # Extract the function
-                    function_element = card.find_element(By.CSS_SELECTOR, "a:nth-child(3) > span")
-                    function = function_element.text.strip()
+    def keep_complete_cards(self, cards):
+        """Drops the cards that are missing a field."""
+        if not cards:
+            self.logger.warning("No parliamentarian cards found on the page.")
 
-                    # Add extracted data to the list
-                    parliamentarians.append({"name": name, "party": party, "function": function})
+        parliamentarians = []
+        for card in cards:
+            if None in card.values():
+                self.logger.warning(f"Missing data for a parliamentarian: {card}")
+                continue  # If any data is missing, continue with the next card
+            parliamentarians.append(card)
+        return parliamentarians
 
-                except NoSuchElementException as e:
-                    self.logger.warning(f"Missing data for a parliamentarian: {str(e)}")
-                    continue  # If any data is missing, continue with the next card
+    def scrape_page(self, page_url):
+        """Extracts the parliamentarians of one page and returns them with the page HTML."""
+        if self.cache is not None:
+            cached = self.cache.get_fresh(page_url, "listing")
+            if cached is not None:
+                self.logger.info(f"Serving {page_url} from cache")
+                return self.extract_parliamentarians_from_html(cached.content), cached.content
 
-        except Exception as e:
-            self.logger.error(f"Error extracting parliamentarians: {str(e)}")
+        # Any free browser of the pool takes the page
+        page_data, html = self.get_driver_pool().call(self.load_page, page_url)
 
-        return parliamentarians
+        if self.cache is not None and page_data:
+            self.cache.store(page_url, 200, {}, html.encode("utf-8"))
+        return page_data, html
+
+    def load_page(self, driver, page_url):
+        """Loads a page in the given driver and returns its parliamentarians and HTML."""
+        if self.lean_browser:
+            self.log_blocking_savings(driver, page_url)
+        self.scheduler.acquire(page_url)
+        start = time.monotonic()
+        try:
+            driver.get(page_url)
+            page_data = self.extract_parliamentarians_from_page(driver)
+        except Exception:
+            self.scheduler.record(page_url, error=True)
+            raise
+        self.scheduler.record(
+            page_url, elapsed=time.monotonic() - start, error=not page_data
+        )
 
-    def go_to_next_page(self, current_page_number):
-        """Navigate to the next page based on the current page number."""
         try:
-            # Construct the next page URL based on the current page number
-            next_page_number = current_page_number + 1
-            if next_page_number > 33:  # Only navigate up to page 33
-                self.logger.info("Reached the last page (page 33).")
-                return None  # Stop if we've reached page 33
+            stats = get_page_stats(driver)
+            self.logger.info(
+                f"Browser loaded {page_url}: {stats['transfer_bytes'] / 1024:.0f} KB in "
+                f"{stats['load_ms']} ms, {stats['blocked']} requests blocked"
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not read page stats: {str(e)}")
 
-            # Generate the next page URL
-            next_page_url = f"{self.base_url}?page={next_page_number}"
+        return page_data, driver.page_source
 
-            self.logger.info(f"Navigating to the next page: {next_page_url}")
-            self.driver.get(next_page_url)  # Navigate to the next page
-            time.sleep(random.uniform(3, 5))  # Allow time for the page to load
-            return next_page_number  # Return the new page number
+    def log_blocking_savings(self, driver, page_url):
+        """Logs, once per run, what resource blocking saves over an unblocked load."""
+        with self.blocking_measured_lock:
+            if self.blocking_measured:
+                return
+            self.blocking_measured = True
 
+        try:
+            self.scheduler.acquire(page_url)
+            self.scheduler.acquire(page_url)
+            baseline, blocked = measure_blocking_savings(driver, page_url)
         except Exception as e:
-            self.logger.error(f"Error navigating to the next page: {str(e)}")
-            return None
+            self.logger.warning(f"Could not measure resource blocking on {page_url}: {str(e)}")
+            return
+        self.logger.info(f"Resource blocking on {page_url}: {format_blocking_savings(baseline, blocked)}")
+
+    def get_page_url(self, directory_url, page_number):
+        """Return the URL of a directory page; the pager is 0-based and page 0 has no ?page= parameter."""
+        if page_number == 0:
+            return directory_url
+        return f"{directory_url}?page={page_number}"
+
+    def get_last_page_number(self, html):
+        """Return the highest ?page=N number referenced by the pagination links (0 without pagination)."""
+        tree = lxml.html.fromstring(html)
+        page_numbers = []
+        for href in tree.xpath("//*[contains(@class, 'pagination')]//a/@href"):
+            page = parse_qs(urlparse(href).query).get("page")
+            if page and page[0].isdigit():
+                page_numbers.append(int(page[0]))
+        return max(page_numbers) if page_numbers else 0
 
     def save_to_json(self, data, filename):
         """Save data to a JSON file."""
@@ -133,25 +234,112 @@ class GeneralizedParliamentScraperArabic:
         except Exception as e:
             self.logger.error(f"Error saving to JSON: {str(e)}")
 
-    def scrape(self):
-        """Main scraping function that iterates through all pages (Arabic version)."""
+    def scrape_numbered_page(self, directory, page_number, last_page=None):
+        """Scrapes one page of a directory unless the interrupted run already completed it.
+
+        Returns the parliamentarians tagged with the directory's term and
+        language, and the page HTML (None when restored from the journal).
+        """
+        stream = f"parliamentarians_{directory['language']}_{directory['term']}"
+        if self.journal.is_completed(stream, page_number):
+            return self.journal.get_records(stream, page_number), None
+
+        page_url = self.get_page_url(directory["url"], page_number)
+        self.logger.info(f"Extracting parliamentarian information from {page_url}...")
+        page_data, html = self.scrape_page(page_url)
+        if not page_data:
+            # Every directory page lists deputies; an empty one failed to render
+            # and is left out of the journal so a resumed run fetches it again
+            raise ValueError(f"No parliamentarians found on {page_url}")
+
+        for parliamentarian in page_data:
+            parliamentarian["term"] = directory["term"]
+            parliamentarian["language"] = directory["language"]
+            self.journal.add_record(stream, page_number, parliamentarian)
+        # The last page number is kept as the cursor so a resumed run skips the discovery
+        if last_page is None:
+            last_page = self.get_last_page_number(html)
+        self.journal.complete_page(stream, page_number, last_page)
+        return page_data, html
+
+    def get_directories(self):
+        """Return one directory per term and language."""
+        return [
+            {"term": term, "language": language, "url": url.format(term=term)}
+            for term in self.terms
+            for language, url in self.directory_urls.items()
+        ]
+
+    def scrape_first_page(self, directory):
+        """Scrapes the first page of a directory and reads its page count from the pagination.
+
+        Returns None when the first page fails: without it the page count is
+        unknown, so the directory is skipped rather than cut to one page.
+        """
+        try:
+            page_data, html = self.scrape_numbered_page(directory, 0)
+        except Exception as e:
+            self.logger.error(f"Skipping {directory['url']}, its first page failed: {str(e)}")
+            return None
+        stream = f"parliamentarians_{directory['language']}_{directory['term']}"
+        last_page = self.get_last_page_number(html) if html else self.journal.get_cursor(stream) or 0
+        self.logger.info(f"{directory['url']} has {last_page + 1} pages")
+        return page_data, last_page
+
+    def scrape_other_page(self, directory, page_number, last_page):
+        """Scrapes a page after the first one, returning None when it fails."""
+        try:
+            return self.scrape_numbered_page(directory, page_number, last_page)[0]
+        except Exception as e:
+            self.logger.error(f"Page {page_number} of {directory['url']} failed: {str(e)}")
+            return None
+
+    def scrape(self, resume=False, journal_file="parliamentarians.journal.jsonl", output_file="parliamentarians.json"):
+        """Main scraping function that spreads every term, language and page over the browser pool."""
         all_parliamentarians = []
         try:
-            self.driver = self.get_driver()
-            self.driver.get(self.base_url)
-            time.sleep(random.uniform(3, 5))  # Allow time for the page to load
+            self.journal = CheckpointJournal(journal_file, resume)
+            directories = self.get_directories()
+
+            with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+                # The first page of each directory gives its page count
+                first_pages = list(executor.map(self.scrape_first_page, directories))
 
-            for page_number in range(1, 34):  # Loop through pages 1 to 33
-                self.logger.info(f"Extracting parliamentarian information from page {page_number}...")
-                page_data = self.extract_parliamentarians_from_page()
-                all_parliamentarians.extend(page_data)
+                # The remaining pages of all directories go to whichever browser is free
+                page_jobs = [
+                    (directory, page_number, first_page[1])
+                    for directory, first_page in zip(directories, first_pages)
+                    if first_page is not None
+                    for page_number in range(1, first_page[1] + 1)
+                ]
+                pages = list(executor.map(lambda job: self.scrape_other_page(*job), page_jobs))
 
-                # Navigate to the next page
-                next_page_number = self.go_to_next_page(page_number)
-                if next_page_number is None:
-                    break  # Stop if we reach the last page
+            # Reassemble in directory and page order, keeping every page that completed
+            remaining = iter(pages)
+            failed = first_pages.count(None)
+            for first_page in first_pages:
+                if first_page is None:
+                    continue
+                first_page_data, last_page = first_page
+                all_parliamentarians.extend(first_page_data)
+                for _ in range(1, last_page + 1):
+                    page_data = next(remaining)
+                    if page_data is None:
+                        failed += 1
+                    else:
+                        all_parliamentarians.extend(page_data)
+            if failed:
+                self.logger.warning(
+                    f"{failed} pages failed (a failed first page skips its directory), "
+                    "run again with --resume to fetch them"
+                )
 
-            self.save_to_json(all_parliamentarians, "parliamentarians_arabic_2021_2026.json")
+            self.scheduler.log_report()
+            self.save_to_json(all_parliamentarians, output_file)
+            if self.storage is not None:
+                for parliamentarian in all_parliamentarians:
+                    self.storage.write("deputies", parliamentarian)
+                self.storage.flush()
             self.logger.info("Scraping completed successfully.")
             return all_parliamentarians
 
@@ -162,7 +350,6 @@ class GeneralizedParliamentScraperArabic:
             self.cleanup()
 
 if __name__ == "__main__":
-    BASE_URL_AR = "https://www.chambredesrepresentants.ma/ar/%D8%AF%D9%84%D9%8A%D9%84-%D8%A3%D8%B9%D8%B6%D8%A7%D8%A1-%D9%85%D8%AC%D9%84%D8%B3-%D8%A7%D9%84%D9%86%D9%88%D8%A7%D8%A8/2021-2026/"
-    scraper_ar = GeneralizedParliamentScraperArabic(BASE_URL_AR)
+    scraper_ar = GeneralizedParliamentScraperArabic(cache=ResponseCache(".http_cache"))
     parliamentarians_ar = scraper_ar.scrape()
     print(parliamentarians_ar)
@@ -1,31 +1,97 @@
+import argparse
+import re
+import time
+
 import pandas as pd
-from transformers import MarianMTModel, MarianTokenizer
 
-# Load the Excel file (replace 'yourfile.xlsx' with your file path)
-df = pd.read_excel("opendata-liste-dep-v2.xlsx")
+from translation_memory import TranslationMemory
+from translator import BACKENDS, Translator
+
+ARABIC_PATTERN = re.compile(r"[؀-ۿ]")
+
+
+def collect_strings(series):
+    """Return the unique non-empty strings of a column that contain Arabic"""
+    values = series.dropna().unique()
+    return {
+        value.strip()
+        for value in values
+        if isinstance(value, str) and value.strip() and ARABIC_PATTERN.search(value)
+    }
+
+
+def translate_strings(texts, translator, memory=None):
+    """Translate unique strings and return {source: translation}
+
+    Strings found in the translation memory are not sent to the model, and
+    new translations are written back to it. A batch that fails is left
+    untranslated.
+    """
+    known = memory.get_many(texts, translator.memory_key) if memory is not None else {}
+    texts = [text for text in texts if text not in known]
+    print(f"{len(known)} strings found in the translation memory, {len(texts)} to translate")
+
+    translations = translator.translate(texts)
+
+    if memory is not None and translations:
+        memory.put_many(translations, translator.memory_key)
+    return {**known, **translations}
 
-# Load the MarianMT model for Arabic to French translation
-model_name = 'Helsinki-NLP/opus-mt-ar-fr'
-model = MarianMTModel.from_pretrained(model_name)
-tokenizer = MarianTokenizer.from_pretrained(model_name)
 
+def translate_dataframe(df, translator, memory=None):
+    """Translate every Arabic cell of a DataFrame, each distinct string once"""
+    # Party and commission names repeat across rows, translate them only once
+    column_texts = {
+        column: collect_strings(df[column])
+        for column in df.select_dtypes(include=["object", "string"]).columns
+    }
+    texts = set().union(*column_texts.values())
+    translations = translate_strings(texts, translator, memory)
 
-# Function to translate Arabic text to French
-def translate_text(text):
+    df_translated = df.copy()
+    for column, column_strings in column_texts.items():
+        if column_strings:
+            translated = df[column].str.strip().map(translations)
+            df_translated[column] = translated.where(translated.notna(), df[column])
+    return df_translated
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Translate the deputies spreadsheet from Arabic to French")
+    parser.add_argument("input_file", nargs="?", default="opendata-liste-dep-v2.xlsx")
+    parser.add_argument("output_file", nargs="?", default="translated_file.xlsx")
+    parser.add_argument("--memory", default="translation_memory.sqlite")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch")
+    parser.add_argument("--intra-op-threads", type=int, default=None)
+    parser.add_argument("--inter-op-threads", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1, help="Processes the batches are sharded over")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    df = pd.read_excel(args.input_file)
+    translator = Translator(
+        backend=args.backend,
+        intra_op_threads=args.intra_op_threads,
+        inter_op_threads=args.inter_op_threads,
+        workers=args.workers,
+    )
+    memory = TranslationMemory(args.memory)
+
+    start = time.monotonic()
     try:
-        if pd.notna(text):
-            # Tokenize and translate
-            translated = model.generate(**tokenizer(text, return_tensors="pt", padding=True))
-            return tokenizer.decode(translated[0], skip_special_tokens=True)
-        return text
-    except Exception as e:
-        print(f"Error translating {text}: {e}")
-        return text
-
-# Apply the translation function to each cell in the DataFrame
-df_translated = df.applymap(translate_text)
-
-# Save the translated DataFrame to a new Excel file
-df_translated.to_excel('translated_file.xlsx', index=False)
-
-print("Translation complete! File saved as 'translated_file.xlsx'.")
+        df_translated = translate_dataframe(df, translator, memory)
+    finally:
+        translator.close()
+        memory.close()
+    print(f"Translated {args.input_file} in {time.monotonic() - start:.1f} s")
+
+    # Save the translated DataFrame to a new Excel file
+    df_translated.to_excel(args.output_file, index=False)
+
+    print(f"Translation complete! File saved as '{args.output_file}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import argparse
+import json
+import logging
+import re
+import sqlite3
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+TATWEEL = "ـ"
+
+
+def normalize_text(text):
+    """Key a source string so spacing and presentation forms do not matter"""
+    text = unicodedata.normalize("NFKC", text).replace(TATWEEL, "")
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+class TranslationMemory:
+    """On-disk store of translations keyed by normalized source text and model
+
+    Lookups and writes are done in bulk so a run pays one query per batch of
+    strings, not one per string. export/load move the memory between machines
+    as JSONL, one {"source", "model", "translation"} object per line.
+    """
+
+    def __init__(self, db_file="translation_memory.sqlite"):
+        self.db_file = db_file
+        self.connection = sqlite3.connect(db_file)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " source TEXT NOT NULL,"
+            " model TEXT NOT NULL,"
+            " translation TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " PRIMARY KEY (source, model))"
+        )
+        self.connection.commit()
+
+    def get_many(self, texts, model_name, chunk_size=500):
+        """Return {text: translation} for the texts already translated by the model"""
+        keys = {}
+        for text in texts:
+            keys.setdefault(normalize_text(text), []).append(text)
+
+        found = {}
+        sources = list(keys)
+        # SQLite limits the number of bound parameters per statement
+        for start in range(0, len(sources), chunk_size):
+            chunk = sources[start:start + chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.connection.execute(
+                f"SELECT source, translation FROM translations"
+                f" WHERE model = ? AND source IN ({placeholders})",
+                [model_name, *chunk],
+            )
+            for source, translation in rows:
+                for text in keys[source]:
+                    found[text] = translation
+        return found
+
+    def put_many(self, translations, model_name):
+        """Store {text: translation} pairs in a single transaction"""
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                [
+                    (normalize_text(text), model_name, translation, now)
+                    for text, translation in translations.items()
+                ],
+            )
+
+    def count(self, model_name=None):
+        if model_name is None:
+            return self.connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM translations WHERE model = ?", (model_name,)
+        ).fetchone()[0]
+
+    def export(self, filename, model_name=None):
+        """Write the memory, or the translations of one model, to a JSONL file"""
+        query = "SELECT source, model, translation FROM translations"
+        params = ()
+        if model_name is not None:
+            query += " WHERE model = ?"
+            params = (model_name,)
+
+        count = 0
+        with open(filename, "w", encoding="utf-8") as f:
+            for source, model, translation in self.connection.execute(query, params):
+                f.write(
+                    json.dumps(
+                        {"source": source, "model": model, "translation": translation},
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+                count += 1
+        logger.info(f"Exported {count} translations to {filename}")
+        return count
+
+    def load(self, filename):
+        """Merge the translations of a JSONL export into the memory"""
+        now = time.time()
+        rows = []
+        with open(filename, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    rows.append(
+                        (normalize_text(entry["source"]), entry["model"], entry["translation"], now)
+                    )
+
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)", rows
+            )
+        logger.info(f"Imported {len(rows)} translations from {filename}")
+        return len(rows)
+
+    def close(self):
+        self.connection.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Export or import the translation memory")
+    parser.add_argument("action", choices=["export", "import", "count"])
+    parser.add_argument("filename", nargs="?", default="translation_memory.jsonl")
+    parser.add_argument("--db", default="translation_memory.sqlite")
+    parser.add_argument("--model", default=None, help="Only export this model's translations")
+    args = parser.parse_args()
+
+    memory = TranslationMemory(args.db)
+    try:
+        if args.action == "export":
+            memory.export(args.filename, args.model)
+        elif args.action == "import":
+            memory.load(args.filename)
+        else:
+            print(f"{memory.count(args.model)} translations")
+    finally:
+        memory.close()
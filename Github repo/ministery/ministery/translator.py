@@ -0,0 +1,284 @@
+import argparse
+import difflib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import torch
+from transformers import MarianMTModel, MarianTokenizer
+
+# MarianMT model for Arabic to French translation
+MODEL_NAME = "Helsinki-NLP/opus-mt-ar-fr"
+BATCH_SIZE = 32
+
+# "torch" is the full fp32 model, "int8" the same model with its Linear
+# layers dynamically quantized, "onnx" an exported ONNX Runtime graph
+BACKENDS = ("torch", "int8", "onnx")
+
+
+def load_model(model_name=MODEL_NAME, backend="torch", intra_op_threads=None, inter_op_threads=None, onnx_dir=None):
+    """Load the tokenizer and a model for the given inference backend"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend}, expected one of {BACKENDS}")
+
+    tokenizer = MarianTokenizer.from_pretrained(model_name)
+
+    if backend == "onnx":
+        # Only needed for this backend
+        try:
+            import onnxruntime
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            raise ImportError(
+                "The onnx backend needs optimum with ONNX Runtime: pip install 'optimum[onnxruntime]'"
+            ) from e
+
+        options = onnxruntime.SessionOptions()
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        if inter_op_threads:
+            options.inter_op_num_threads = inter_op_threads
+
+        # The graph is exported once and reused by later runs
+        onnx_dir = onnx_dir or f"{model_name.split('/')[-1]}-onnx"
+        if os.path.isdir(onnx_dir):
+            model = ORTModelForSeq2SeqLM.from_pretrained(onnx_dir, session_options=options)
+        else:
+            model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, session_options=options)
+            model.save_pretrained(onnx_dir)
+        return model, tokenizer
+
+    if intra_op_threads:
+        torch.set_num_threads(intra_op_threads)
+    if inter_op_threads:
+        try:
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError:
+            # Can only be set once per process, before any parallel work
+            pass
+
+    model = MarianMTModel.from_pretrained(model_name)
+    model.eval()
+    if backend == "int8":
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model, tokenizer
+
+
+class Translator:
+    """Arabic to French translator with a selectable CPU inference backend
+
+    translate() sorts its input by length and runs it in padded batches. With
+    workers > 1 the batches are sharded over a process pool, each process
+    loading its own model with intra_op_threads threads (the cores divided
+    between the workers by default).
+    """
+
+    def __init__(
+        self,
+        model_name=MODEL_NAME,
+        backend="torch",
+        batch_size=BATCH_SIZE,
+        intra_op_threads=None,
+        inter_op_threads=None,
+        workers=1,
+        onnx_dir=None,
+    ):
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
+        self.workers = workers
+        self.intra_op_threads = intra_op_threads or (
+            max(1, (os.cpu_count() or 1) // workers) if workers > 1 else None
+        )
+        self.inter_op_threads = inter_op_threads
+        self.onnx_dir = onnx_dir
+        self.model = None
+        self.tokenizer = None
+        self.pool = None
+
+    @property
+    def memory_key(self):
+        """Name under which translations are kept in the translation memory"""
+        if self.backend == "torch":
+            return self.model_name
+        return f"{self.model_name}#{self.backend}"
+
+    def get_config(self):
+        return {
+            "model_name": self.model_name,
+            "backend": self.backend,
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads,
+            "onnx_dir": self.onnx_dir,
+        }
+
+    def load(self):
+        if self.model is None:
+            self.model, self.tokenizer = load_model(**self.get_config())
+        return self
+
+    def translate_batch(self, texts):
+        """Translate one padded batch of strings"""
+        self.load()
+        inputs = self.tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+        with torch.inference_mode():
+            translated = self.model.generate(**inputs)
+        return self.tokenizer.batch_decode(translated, skip_special_tokens=True)
+
+    def translate(self, texts):
+        """Return {text: translation}; the texts of a batch that fails are left out"""
+        texts = sorted(set(texts), key=len)
+        batches = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+
+        if self.workers > 1 and len(batches) > 1:
+            results = self.get_pool().map(translate_in_worker, batches)
+        else:
+            results = map(self.translate_batch_safely, batches)
+
+        translations = {}
+        for batch, translated in zip(batches, results):
+            if translated is not None:
+                translations.update(zip(batch, translated))
+        return translations
+
+    def get_pool(self):
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=init_worker,
+                initargs=(self.get_config(),),
+            )
+        return self.pool
+
+    def warm_up(self, texts):
+        """Load the model where translate() will run it, in every worker if any
+
+        A worker loads its model before taking its first batch, so one small
+        batch is translated by each worker before returning.
+        """
+        # translate() runs a single batch in this process
+        if self.workers <= 1 or len(set(texts)) <= self.batch_size:
+            self.load()
+            return self
+        batch = sorted(texts, key=len)[:1]
+        warmed = set()
+        while len(warmed) < self.workers:
+            warmed.update(self.get_pool().map(warm_up_worker, [batch] * self.workers))
+        return self
+
+    def translate_batch_safely(self, batch):
+        try:
+            return self.translate_batch(batch)
+        except Exception as e:
+            print(f"Error translating batch starting with {batch[0]}: {e}")
+            return None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+
+# Each process of the pool keeps its own model
+worker_translator = None
+
+
+def init_worker(config):
+    global worker_translator
+    worker_translator = Translator(
+        config["model_name"],
+        config["backend"],
+        intra_op_threads=config["intra_op_threads"],
+        inter_op_threads=config["inter_op_threads"],
+        onnx_dir=config["onnx_dir"],
+    ).load()
+
+
+def translate_in_worker(batch):
+    return worker_translator.translate_batch_safely(batch)
+
+
+def warm_up_worker(batch):
+    worker_translator.translate_batch_safely(batch)
+    return os.getpid()
+
+
+def similarity(a, b):
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+def compare_backends(texts, backends=BACKENDS, **translator_options):
+    """Translate the same sample with each backend and report speed and quality
+
+    Quality is measured against the fp32 "torch" output: the share of
+    identical translations and the mean character similarity.
+    """
+    outputs = {}
+    report = {}
+    for backend in ("torch", *[b for b in backends if b != "torch"]):
+        translator = Translator(backend=backend, **translator_options)
+        try:
+            # Model loading, in the parent or in each worker, is not part of the measured time
+            translator.warm_up(texts)
+            start = time.monotonic()
+            outputs[backend] = translator.translate(texts)
+            elapsed = time.monotonic() - start
+        finally:
+            translator.close()
+
+        reference = outputs["torch"]
+        common = [text for text in outputs[backend] if text in reference]
+        report[backend] = {
+            "strings": len(outputs[backend]),
+            "seconds": round(elapsed, 2),
+            "strings_per_second": round(len(outputs[backend]) / elapsed, 1) if elapsed else None,
+            "identical": round(
+                sum(outputs[backend][t] == reference[t] for t in common) / len(common), 3
+            ) if common else None,
+            "similarity": round(
+                sum(similarity(outputs[backend][t], reference[t]) for t in common) / len(common), 3
+            ) if common else None,
+        }
+        print(f"{backend}: {report[backend]}")
+    return report
+
+
+def load_legislation_titles(json_file):
+    """Return the titles of every law of a legislation JSON file"""
+    with open(json_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [law["title"] for laws in data.values() for law in laws if law.get("title")]
+
+
+if __name__ == "__main__":
+    from scraping_deputies import ARABIC_PATTERN, collect_strings
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Compare the speed and quality of the translation backends")
+    parser.add_argument("input_file", nargs="?", default="opendata-liste-dep-v2.xlsx",
+                        help="Spreadsheet, or a legislation JSON file whose titles are sampled")
+    parser.add_argument("--sample", type=int, default=200)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--intra-op-threads", type=int, default=None)
+    parser.add_argument("--inter-op-threads", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.input_file.endswith(".json"):
+        texts = {title for title in load_legislation_titles(args.input_file) if ARABIC_PATTERN.search(title)}
+    else:
+        df = pd.read_excel(args.input_file)
+        texts = set().union(*(collect_strings(df[column]) for column in df.select_dtypes(include=["object", "string"]).columns))
+
+    sample = random.Random(0).sample(sorted(texts), min(args.sample, len(texts)))
+    compare_backends(
+        sample,
+        args.backends,
+        batch_size=args.batch_size,
+        intra_op_threads=args.intra_op_threads,
+        inter_op_threads=args.inter_op_threads,
+        workers=args.workers,
+    )
@@ -0,0 +1,220 @@
+import argparse
+import json
+import os
+import time
+import logging
+
+import pandas as pd
+
+from dates import fill_iso_dates
+
+logger = logging.getLogger(__name__)
+
+GROUP_COLUMNS = ["category", "legislature_period", "commission"]
+
+# Additive counters kept per group; rates and averages are derived from
+# them when served, so an update only has to add the change of each law
+COUNTERS = [
+    "laws",
+    "voted_readings",
+    "unanimous",
+    "margin_sum",
+    "margin_count",
+    "days_sum",
+    "days_count",
+]
+
+
+def load_laws(json_file):
+    """Return the laws of a legislation output as one DataFrame, category included"""
+    with open(json_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    frames = [pd.DataFrame(records).assign(category=category) for category, records in data.items() if records]
+    laws = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    for column in ("url", "legislature_period", "commission", "date", "date_iso", "readings"):
+        if column not in laws:
+            laws[column] = None
+    laws["date_iso"] = fill_iso_dates(laws["date_iso"], laws["date"])
+    return laws
+
+
+def get_readings(laws):
+    """Flatten the readings and their votes into one row per reading"""
+    readings = (
+        laws[["category", "url", "readings"]].explode("readings").dropna(subset=["readings"]).reset_index(drop=True)
+    )
+    if readings.empty:
+        return pd.DataFrame(
+            columns=["category", "url", "commission", "deposit_date_iso", "unanimous", "yes", "no", "voted"]
+        )
+    details = pd.json_normalize(readings["readings"].tolist())
+    details.index = readings.index
+    readings = readings[["category", "url"]].join(details)
+    for column in ("commission", "deposit_date", "deposit_date_iso", "vote.unanimous", "vote.yes", "vote.no"):
+        if column not in readings:
+            readings[column] = None
+    readings["deposit_date_iso"] = fill_iso_dates(readings["deposit_date_iso"], readings["deposit_date"])
+    readings = readings.rename(
+        columns={"vote.unanimous": "unanimous", "vote.yes": "yes", "vote.no": "no"}
+    )
+    readings["voted"] = readings[["unanimous", "yes", "no"]].notna().any(axis=1)
+    return readings
+
+
+def compute_facts(laws):
+    """Return one row of counters per law, keyed by category and url
+
+    Everything is computed column-wise over the whole corpus. The time to
+    vote of an adopted text runs from the earliest deposit date of any
+    reading of the same url to the date heading its card on the adopted
+    listing (see GenericScraper.get_card_dates).
+    """
+    readings = get_readings(laws)
+    margins = readings["yes"].astype(float) - readings["no"].astype(float)
+    readings = readings.assign(
+        unanimous=readings["unanimous"].fillna(False).astype(bool).astype(int),
+        margin_sum=margins.fillna(0),
+        margin_count=margins.notna().astype(int),
+        voted_readings=readings["voted"].astype(int),
+    )
+    per_law = readings.groupby(["category", "url"])[
+        ["voted_readings", "unanimous", "margin_sum", "margin_count"]
+    ].sum()
+    first_commission = readings.dropna(subset=["commission"]).groupby(["category", "url"])["commission"].first()
+    deposit_dates = pd.to_datetime(readings["deposit_date_iso"], errors="coerce").groupby(readings["url"]).min()
+
+    facts = laws[["category", "url", "legislature_period", "commission", "date_iso"]].drop_duplicates(
+        ["category", "url"], keep="last"
+    ).set_index(["category", "url"])
+    facts = facts.join(per_law).fillna({column: 0 for column in per_law.columns})
+    facts["commission"] = facts["commission"].fillna(first_commission.reindex(facts.index))
+
+    # Bills only get a legislature through the adopted text of the same url
+    urls = facts.index.get_level_values("url")
+    periods = laws.dropna(subset=["legislature_period"]).groupby("url")["legislature_period"].last()
+    facts["legislature_period"] = facts["legislature_period"].fillna(
+        pd.Series(periods.reindex(urls).to_numpy(), index=facts.index)
+    )
+    facts[["legislature_period", "commission"]] = facts[["legislature_period", "commission"]].fillna("")
+    facts["category"] = facts.index.get_level_values("category")
+    facts["laws"] = 1
+
+    deposited = deposit_dates.reindex(urls).to_numpy()
+    days = (pd.to_datetime(facts["date_iso"], errors="coerce") - deposited).dt.days
+    facts["days_sum"] = days.fillna(0)
+    facts["days_count"] = days.notna().astype(int)
+
+    facts.index = facts.index.map("|".join)
+    return facts[GROUP_COLUMNS + COUNTERS]
+
+
+def aggregate(facts):
+    return facts.groupby(GROUP_COLUMNS)[COUNTERS].sum()
+
+
+def load_json(filename, default):
+    if not os.path.exists(filename):
+        return default
+    with open(filename, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(data, filename):
+    temp_file = f"{filename}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temp_file, filename)
+
+
+def update_analytics(json_file, cache_file="analytics_cache.json", facts_file="analytics_facts.json"):
+    """Fold the laws of a legislation output into the materialized aggregates
+
+    The counters of every law are kept in facts_file. Only laws whose
+    counters changed since the last update contribute: their old counters
+    are subtracted from their groups and the new ones added. The cache file
+    only holds the per-group totals. Returns the number of laws that changed.
+    """
+    stored = load_json(facts_file, {"index": [], "columns": GROUP_COLUMNS + COUNTERS, "data": []})
+    old_facts = pd.DataFrame(stored["data"], index=stored["index"], columns=stored["columns"])
+    new_facts = compute_facts(load_laws(json_file))
+
+    # Laws missing from the new output are kept, a refresh never drops laws
+    common = new_facts.index.intersection(old_facts.index)
+    unchanged = common[
+        (new_facts.loc[common].astype(str) == old_facts.loc[common].astype(str)).all(axis=1)
+    ]
+    changed_index = new_facts.index.difference(unchanged)
+    replaced = old_facts.loc[old_facts.index.intersection(changed_index)]
+
+    cache = load_json(cache_file, {"aggregates": []})
+    aggregates = (
+        pd.DataFrame(cache["aggregates"]).set_index(GROUP_COLUMNS)
+        if cache["aggregates"]
+        else pd.DataFrame(columns=COUNTERS, index=pd.MultiIndex.from_tuples([], names=GROUP_COLUMNS))
+    )
+    aggregates = aggregates.add(aggregate(new_facts.loc[changed_index]), fill_value=0)
+    aggregates = aggregates.sub(aggregate(replaced), fill_value=0)
+    aggregates = aggregates[aggregates["laws"] > 0]
+
+    facts = pd.concat([old_facts.drop(replaced.index), new_facts.loc[changed_index]])
+    write_json(facts.to_dict(orient="split"), facts_file)
+    write_json(
+        {
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "source": json_file,
+            "aggregates": aggregates.reset_index().to_dict(orient="records"),
+        },
+        cache_file,
+    )
+
+    logger.info(f"Updated analytics with {len(changed_index)} new or changed laws")
+    return len(changed_index)
+
+
+def get_report(cache_file="analytics_cache.json", by=GROUP_COLUMNS):
+    """Serve the aggregates from the cache file, grouped by the given columns
+
+    Each row has the number of laws, the unanimity rate of the voted
+    readings, the average yes - no margin and the average days from deposit
+    to vote.
+    """
+    cache = load_json(cache_file, {"aggregates": []})
+    if not cache["aggregates"]:
+        return []
+    totals = pd.DataFrame(cache["aggregates"]).groupby(list(by))[COUNTERS].sum()
+    report = pd.DataFrame(
+        {
+            "laws": totals["laws"].astype(int),
+            "voted_readings": totals["voted_readings"].astype(int),
+            "unanimity_rate": totals["unanimous"] / totals["voted_readings"].where(totals["voted_readings"] > 0),
+            "average_margin": totals["margin_sum"] / totals["margin_count"].where(totals["margin_count"] > 0),
+            "average_days_to_vote": totals["days_sum"] / totals["days_count"].where(totals["days_count"] > 0),
+        }
+    ).round(3)
+    report = report.astype(object).where(report.notna(), None)
+    return report.reset_index().to_dict(orient="records")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Vote and throughput analytics over the legislation corpus")
+    parser.add_argument("--cache", default="analytics_cache.json")
+    parser.add_argument("--facts", default="analytics_facts.json")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    update_parser = subparsers.add_parser("update", help="Fold a legislation output into the aggregates")
+    update_parser.add_argument("json_file", nargs="?", default="moroccan_legislation_all.json")
+
+    report_parser = subparsers.add_parser("report", help="Print the aggregates")
+    report_parser.add_argument(
+        "--by", nargs="+", choices=GROUP_COLUMNS, default=GROUP_COLUMNS
+    )
+    args = parser.parse_args()
+
+    if args.action == "update":
+        update_analytics(args.json_file, args.cache, args.facts)
+    else:
+        for row in get_report(args.cache, args.by):
+            print(json.dumps(row, ensure_ascii=False))
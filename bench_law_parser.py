@@ -0,0 +1,61 @@
+import argparse
+import glob
+import json
+import os
+import time
+
+from law_parser import is_law_detail_url, parse_readings
+
+
+def is_cached_law_page(body_path):
+    """Check from its metadata that a response cache body is a law detail page"""
+    try:
+        with open(f"{body_path[:-len('.body')]}.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return meta.get("status") == 200 and is_law_detail_url(meta.get("url", ""))
+
+
+def load_pages(directory):
+    """Load saved detail pages: *.html files or the law pages of the response cache"""
+    paths = glob.glob(os.path.join(directory, "**", "*.html"), recursive=True)
+    paths += [
+        path
+        for path in glob.glob(os.path.join(directory, "**", "*.body"), recursive=True)
+        if is_cached_law_page(path)
+    ]
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            page = f.read()
+        if page.strip():
+            pages.append(page)
+    return pages
+
+
+def benchmark(pages, repeat=3):
+    """Parse every page repeat times and return the best pages/second"""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        readings = sum(len(parse_readings(page)) for page in pages)
+        elapsed = time.perf_counter() - start
+        best = max(best, len(pages) / elapsed)
+    return best, readings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the law detail page parser")
+    parser.add_argument("directory", nargs="?", default=".http_cache")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_pages(args.directory)
+    if not pages:
+        print(f"No saved pages found in {args.directory}")
+    else:
+        total_bytes = sum(len(page) for page in pages)
+        rate, readings = benchmark(pages, args.repeat)
+        print(f"Parsed {len(pages)} pages ({total_bytes / 1e6:.1f} MB), {readings} readings")
+        print(f"Best of {args.repeat}: {rate:.0f} pages/second")
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import time
+import threading
+import logging
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, quote, unquote
+
+logger = logging.getLogger(__name__)
+
+# Default time-to-live in seconds for each class of URL
+DEFAULT_TTLS = {
+    "listing": 6 * 60 * 60,
+    "detail": 30 * 24 * 60 * 60,
+}
+
+
+def temp_path(path):
+    """Return a temporary path next to path that is unique to this thread"""
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+
+def normalize_url(url):
+    """Normalize a URL so equivalent spellings share one cache entry"""
+    parts = urlsplit(url)
+    path = quote(unquote(parts.path), safe="/%") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, query, "")
+    )
+
+
+class CachedResponse:
+    """Response served from the on-disk cache"""
+
+    def __init__(self, url, status_code, headers, content, fetched_at):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.fetched_at = fetched_at
+        self.from_cache = True
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache of fetched pages keyed by normalized URL"""
+
+    def __init__(self, cache_dir=".http_cache", ttls=None):
+        self.cache_dir = cache_dir
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_paths(self, url):
+        """Return the metadata and body paths for a URL"""
+        key = hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+        directory = os.path.join(self.cache_dir, key[:2])
+        return (
+            os.path.join(directory, f"{key}.json"),
+            os.path.join(directory, f"{key}.body"),
+        )
+
+    def get(self, url):
+        """Return the cached response for a URL, fresh or stale, or None"""
+        meta_path, body_path = self.get_paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+
+        return CachedResponse(
+            meta["url"], meta["status"], meta["headers"], body, meta["fetched_at"]
+        )
+
+    def is_fresh(self, response, url_class="listing"):
+        """Check whether a cached response is younger than its class TTL"""
+        return time.time() - response.fetched_at < self.ttls[url_class]
+
+    def get_fresh(self, url, url_class="listing"):
+        """Return the cached response for a URL only if it is still fresh"""
+        response = self.get(url)
+        if response is not None and self.is_fresh(response, url_class):
+            return response
+        return None
+
+    def validation_headers(self, response):
+        """Build conditional request headers from a cached response"""
+        headers = {}
+        cached_headers = {k.lower(): v for k, v in response.headers.items()}
+        etag = cached_headers.get("etag")
+        last_modified = cached_headers.get("last-modified")
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def store(self, url, status, headers, body):
+        """Write a response to disk, replacing any previous entry"""
+        meta_path, body_path = self.get_paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": dict(headers),
+            "fetched_at": time.time(),
+        }
+        try:
+            # Write to temporary files first so readers never see a partial entry
+            with open(temp_path(body_path), "wb") as f:
+                f.write(body)
+            with open(temp_path(meta_path), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(temp_path(body_path), body_path)
+            os.replace(temp_path(meta_path), meta_path)
+        except OSError as e:
+            logger.error(f"Error writing cache entry for {url}: {str(e)}")
+
+    def touch(self, url):
+        """Mark a cached response as fetched now after a successful revalidation"""
+        meta_path, _ = self.get_paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            meta["fetched_at"] = time.time()
+            with open(temp_path(meta_path), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(temp_path(meta_path), meta_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error refreshing cache entry for {url}: {str(e)}")
@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointJournal:
+    """Append-only JSONL journal of completed pages and the records they emitted
+
+    Each crawl loop writes to its own stream (e.g. "questions" or
+    "projets_listing"). Records are tagged with the page that emitted them and
+    are only restored on resume once that page was marked complete, so a crash
+    in the middle of a page never leaves half of it behind.
+    """
+
+    def __init__(self, filename, resume=False):
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.completed = {}
+        self.cursors = {}
+        self.records = {}
+
+        if resume and os.path.exists(filename):
+            self.load()
+        else:
+            open(filename, "w", encoding="utf-8").close()
+
+        self.file = open(filename, "a", encoding="utf-8")
+
+    def load(self):
+        """Replay the journal to rebuild completed pages, cursors and records"""
+        pending = {}
+        with open(self.filename, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash can leave the last line half written
+                    logger.warning(f"Skipping corrupt journal line in {self.filename}")
+                    continue
+
+                key = (entry["stream"], str(entry["page"]))
+                if entry["type"] == "record":
+                    pending.setdefault(key, []).append(entry["record"])
+                elif entry["type"] == "page":
+                    self.completed.setdefault(entry["stream"], set()).add(key[1])
+                    self.records.setdefault(entry["stream"], {})[key[1]] = pending.pop(
+                        key, []
+                    )
+                    self.cursors[entry["stream"]] = entry.get("cursor")
+
+        pages = sum(len(pages) for pages in self.completed.values())
+        logger.info(f"Resuming from {self.filename}: {pages} pages already completed")
+
+    def append(self, entry):
+        with self.lock:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.file.flush()
+
+    def add_record(self, stream, page, record):
+        """Journal a record emitted by a page"""
+        self.append({"type": "record", "stream": stream, "page": page, "record": record})
+
+    def complete_page(self, stream, page, cursor=None):
+        """Mark a page as completed, with the cursor to continue from"""
+        self.append({"type": "page", "stream": stream, "page": page, "cursor": cursor})
+
+    def has_completed_pages(self, stream):
+        return bool(self.completed.get(stream))
+
+    def count_completed(self, stream):
+        return len(self.completed.get(stream, ()))
+
+    def is_completed(self, stream, page):
+        return str(page) in self.completed.get(stream, ())
+
+    def get_cursor(self, stream):
+        """Return the cursor saved with the last completed page of a stream"""
+        return self.cursors.get(stream)
+
+    def get_records(self, stream, page=None):
+        """Return the records of one completed page, or of all of them in order"""
+        pages = self.records.get(stream, {})
+        if page is not None:
+            return pages.get(str(page), [])
+        return [record for page_records in pages.values() for record in page_records]
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
@@ -1,3 +1,24 @@
 #LAWS_URL = "https://www.chambredesrepresentants.ma/fr/action-legislative"
+LAWS_URL = "https://www.chambredesrepresentants.ma/ar"
 #QUESTION_URL = "https://www.chambredesrepresentants.ma/ar/%D9%85%D8%B1%D8%A7%D9%82%D8%A8%D8%A9-%D8%A7%D9%84%D8%B9%D9%85%D9%84-%D8%A7%D9%84%D8%AD%D9%83%D9%88%D9%85%D9%8A/%D8%A7%D9%84%D8%A3%D8%B3%D9%80%D8%A6%D9%84%D8%A9-%D8%A7%D9%84%D8%B4%D9%81%D9%88%D9%8A%D8%A9"
-QUESTION_URL = "https://www.chambredesrepresentants.ma/ar/%D9%85%D8%B1%D8%A7%D9%82%D8%A8%D8%A9-%D8%A7%D9%84%D8%B9%D9%85%D9%84-%D8%A7%D9%84%D8%AD%D9%83%D9%88%D9%85%D9%8A/%D8%A7%D9%84%D8%A3%D8%B3%D9%80%D8%A6%D9%84%D8%A9-%D8%A7%D9%84%D8%B4%D9%81%D9%88%D9%8A%D8%A9?page=703"
+QUESTION_URL = "https://www.chambredesrepresentants.ma/ar/%D9%85%D8%B1%D8%A7%D9%82%D8%A8%D8%A9-%D8%A7%D9%84%D8%B9%D9%85%D9%84-%D8%A7%D9%84%D8%AD%D9%83%D9%88%D9%85%D9%8A/%D8%A7%D9%84%D8%A3%D8%B3%D9%80%D8%A6%D9%84%D8%A9-%D8%A7%D9%84%D8%B4%D9%81%D9%88%D9%8A%D8%A9"
+
+# Concurrent detail-page workers and the cap on simultaneous requests per host
+MAX_WORKERS = 8
+MAX_PER_HOST = 4
+
+# Number of page ranges the question listing is split into and scraped in parallel
+QUESTION_SHARDS = 8
+
+# On-disk response cache and time-to-live in seconds per URL class
+CACHE_DIR = ".http_cache"
+CACHE_TTLS = {"listing": 6 * 60 * 60, "detail": 30 * 24 * 60 * 60}
+
+# Adaptive per-host rate limit (requests/second), see scheduler.RateScheduler
+RATE_LIMIT = {"initial_rate": 2.0, "min_rate": 0.2, "max_rate": 20.0}
+
+# Number of pre-launched browsers used when pages need a real browser
+BROWSER_POOL_SIZE = 4
+
+# SQLite database written with --db
+DB_FILE = "moroccan_parliament.sqlite"
@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import re
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Month names as written on the site (Maghrebi), in the Levant and Egypt,
+# and in French, keyed in their normalized spelling (see normalize_strings)
+MONTHS = {
+    # Maghrebi
+    "يناير": 1, "فبراير": 2, "مارس": 3, "ابريل": 4, "ماي": 5, "يونيو": 6,
+    "يوليوز": 7, "غشت": 8, "شتنبر": 9, "اكتوبر": 10, "نونبر": 11, "دجنبر": 12,
+    # Egyptian
+    "مايو": 5, "يوليو": 7, "اغسطس": 8, "سبتمبر": 9, "نوفمبر": 11, "ديسمبر": 12,
+    # Levantine
+    "كانون الثاني": 1, "شباط": 2, "اذار": 3, "نيسان": 4, "ايار": 5, "حزيران": 6,
+    "تموز": 7, "اب": 8, "ايلول": 9, "تشرين الاول": 10, "تشرين الثاني": 11, "كانون الاول": 12,
+    # French
+    "janvier": 1, "fevrier": 2, "février": 2, "mars": 3, "avril": 4, "mai": 5, "juin": 6,
+    "juillet": 7, "aout": 8, "août": 8, "septembre": 9, "octobre": 10,
+    "novembre": 11, "decembre": 12, "décembre": 12,
+}
+
+# Alef variants, Arabic-Indic digits and diacritics/tatweel are unified
+# before matching; the weekday in front of a date is simply skipped
+TRANSLATION = str.maketrans(
+    {"أ": "ا", "إ": "ا", "آ": "ا", **{chr(0x0660 + i): str(i) for i in range(10)}}
+)
+STRIP_PATTERN = r"[\u064B-\u0652\u0640]"
+
+MONTH_PATTERN = "|".join(sorted(map(re.escape, MONTHS), key=len, reverse=True))
+TEXT_DATE_PATTERN = rf"(?P<day>\d{{1,2}})(?:er)?\s+(?P<month>{MONTH_PATTERN})\s+(?P<year>\d{{4}})"
+NUMERIC_DATE_PATTERN = r"(?P<day>\d{1,2})[/.-](?P<month>\d{1,2})[/.-](?P<year>\d{4})"
+ISO_DATE_PATTERN = r"(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})"
+
+# Date strings parsed so far, {original: ISO date or None}. The scrapers and
+# the storage use it from several threads, so it is only touched under the
+# lock, and the oldest entries are dropped past DATE_CACHE_SIZE
+DATE_CACHE = {}
+DATE_CACHE_SIZE = 100_000
+DATE_CACHE_LOCK = threading.Lock()
+
+
+def normalize_strings(values):
+    """Unify spelling variants of a Series of strings in one vectorized pass"""
+    return (
+        values.str.translate(TRANSLATION)
+        .str.replace(STRIP_PATTERN, "", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+        .str.lower()
+    )
+
+
+def parse_dates(values):
+    """Convert a Series of distinct date strings to ISO dates (None if unparsed)"""
+    normalized = normalize_strings(values)
+
+    text = normalized.str.extract(TEXT_DATE_PATTERN)
+    text["month"] = text["month"].map(MONTHS)
+    numeric = normalized.str.extract(NUMERIC_DATE_PATTERN)
+    iso = normalized.str.extract(ISO_DATE_PATTERN)
+
+    # ISO timestamps (<time datetime>) first, then textual, then d/m/Y dates
+    parts = iso.astype(float).fillna(text.astype(float)).fillna(numeric.astype(float))
+    dates = pd.to_datetime(
+        {"year": parts["year"], "month": parts["month"], "day": parts["day"]},
+        errors="coerce",
+    )
+    return dates.dt.strftime("%Y-%m-%d").astype(object).where(dates.notna(), None)
+
+
+def normalize_dates(values):
+    """Convert a column of date strings to ISO dates
+
+    Only the distinct strings missing from the memo are parsed; the column is
+    then rebuilt from the factorized codes with a single NumPy take.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    strings = [value for value in uniques if isinstance(value, str)]
+    with DATE_CACHE_LOCK:
+        known = {value: DATE_CACHE[value] for value in strings if value in DATE_CACHE}
+
+    # Parsing is done outside the lock, other threads only wait for the memo
+    missing = [value for value in strings if value not in known]
+    if missing:
+        parsed = dict(zip(missing, parse_dates(pd.Series(missing, dtype=object))))
+        known.update(parsed)
+        with DATE_CACHE_LOCK:
+            DATE_CACHE.update(parsed)
+            for value in list(DATE_CACHE)[: max(0, len(DATE_CACHE) - DATE_CACHE_SIZE)]:
+                del DATE_CACHE[value]
+
+    iso = np.array([known.get(value) for value in uniques] + [None], dtype=object)
+    # Missing values have code -1, which takes the trailing None
+    return iso[codes].tolist()
+
+
+def normalize_date(value):
+    """Convert a single date string to an ISO date, through the memo"""
+    if not isinstance(value, str):
+        return None
+    return normalize_dates([value])[0]
+
+
+def fill_iso_date(iso_date, value):
+    """Return the ISO date of a record, normalizing its date string if it has none
+
+    Outputs scraped before the ISO dates were added only have the date
+    strings; storage and analytics fill their ISO dates through this and
+    fill_iso_dates when reading them.
+    """
+    return iso_date or normalize_date(value)
+
+
+def fill_iso_dates(iso_dates, values):
+    """Return a column of ISO dates, normalizing the date strings where they are missing"""
+    iso_dates = pd.Series(iso_dates, dtype=object)
+    normalized = pd.Series(normalize_dates(values), index=iso_dates.index, dtype=object)
+    return iso_dates.where(iso_dates.notna() & (iso_dates != ""), normalized)
+
+
+def with_iso_date(record, field="date"):
+    """Return the record with <field>_iso inserted right after field"""
+    result = {}
+    for key, value in record.items():
+        if key != f"{field}_iso":
+            result[key] = value
+        if key == field:
+            result[f"{field}_iso"] = normalize_date(value)
+    return result
+
+
+def add_iso_dates(records, field="date"):
+    """Add <field>_iso next to field in every record, converting the column at once"""
+    normalize_dates([record.get(field) for record in records])
+    return [with_iso_date(record, field) if field in record else record for record in records]
+
+
+def add_iso_dates_to_file(json_file):
+    """Add date_iso to the records, and deposit_date_iso to their readings, of a JSON output"""
+    with open(json_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    sections = data if isinstance(data, dict) else {None: data}
+    for category, records in sections.items():
+        if not isinstance(records, list):
+            continue
+        readings = [r for record in records for r in record.get("readings") or []]
+        normalize_dates([reading.get("deposit_date") for reading in readings])
+        records = add_iso_dates(records)
+        for record in records:
+            if record.get("readings"):
+                record["readings"] = add_iso_dates(record["readings"], "deposit_date")
+        if category is None:
+            data = records
+        else:
+            data[category] = records
+
+    temp_file = f"{json_file}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(temp_file, json_file)
+
+    with DATE_CACHE_LOCK:
+        memo = dict(DATE_CACHE)
+    unparsed = sorted(value for value, iso in memo.items() if iso is None)
+    logger.info(f"Normalized {len(memo)} distinct dates in {json_file}, {len(unparsed)} unparsed")
+    for value in unparsed[:10]:
+        logger.warning(f"Could not parse date: {value}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Add ISO dates next to the scraped date strings")
+    parser.add_argument("json_files", nargs="+")
+    args = parser.parse_args()
+
+    for json_file in args.json_files:
+        add_iso_dates_to_file(json_file)
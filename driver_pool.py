@@ -0,0 +1,140 @@
+import queue
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+from urllib3.exceptions import HTTPError as ConnectionLostError
+
+logger = logging.getLogger(__name__)
+
+# Errors meaning the browser session is gone, as opposed to page-level errors
+# (timeouts, missing elements) that leave the driver usable
+SESSION_ERRORS = (InvalidSessionIdException, ConnectionError, ConnectionLostError)
+SESSION_LOST_MESSAGES = ("chrome not reachable", "disconnected", "session deleted")
+
+
+def is_session_lost(error):
+    """Check whether an error means the driver has to be relaunched"""
+    if isinstance(error, SESSION_ERRORS):
+        return True
+    # Crashed browsers surface as a bare WebDriverException, its subclasses
+    # (TimeoutException, NoSuchElementException, ...) are page-level errors
+    return type(error) is WebDriverException and any(
+        message in str(error) for message in SESSION_LOST_MESSAGES
+    )
+
+
+class DriverPool:
+    """Pool of pre-launched browsers handed to whichever worker asks first
+
+    factory(slot) must return a new driver for the given slot number; each
+    slot keeps its own user-data dir, user agent and window size. A driver
+    whose session is lost is quit and relaunched in its slot; timeouts and
+    lookup errors are raised unchanged and the driver is reused.
+    """
+
+    def __init__(self, factory, size=4):
+        self.factory = factory
+        self.size = size
+        self.idle = queue.Queue()
+        self.slots = {}
+        self.failed_slots = []
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Launch all the browsers in parallel"""
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            drivers = list(executor.map(self.factory, range(self.size)))
+
+        for slot, driver in enumerate(drivers):
+            with self.lock:
+                self.slots[driver] = slot
+            self.idle.put(driver)
+        logger.info(f"Started a pool of {self.size} browsers")
+        return self
+
+    def launch(self, slot):
+        driver = self.factory(slot)
+        with self.lock:
+            self.slots[driver] = slot
+        return driver
+
+    def recycle(self, driver):
+        """Quit a crashed driver and launch a replacement in the same slot
+
+        Returns None if the replacement fails to launch; the slot is then
+        relaunched by the next caller that finds no idle driver.
+        """
+        with self.lock:
+            slot = self.slots.pop(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+        logger.warning(f"Relaunching browser in slot {slot}")
+        try:
+            return self.launch(slot)
+        except Exception as e:
+            logger.error(f"Could not relaunch browser in slot {slot}: {str(e)}")
+            with self.lock:
+                self.failed_slots.append(slot)
+            return None
+
+    def acquire(self):
+        """Take an idle driver, relaunching a failed slot rather than waiting"""
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self.lock:
+            slot = self.failed_slots.pop() if self.failed_slots else None
+        if slot is None:
+            return self.idle.get()
+        try:
+            return self.launch(slot)
+        except Exception:
+            with self.lock:
+                self.failed_slots.append(slot)
+            raise
+
+    @contextmanager
+    def driver(self):
+        """Borrow an idle driver, recycling it if its session is lost while in use"""
+        driver = self.acquire()
+        try:
+            yield driver
+        except Exception as e:
+            if is_session_lost(e):
+                driver = self.recycle(driver)
+            raise
+        finally:
+            # A driver that failed to relaunch is never handed out again
+            if driver is not None:
+                self.idle.put(driver)
+
+    def call(self, fn, item, retries=1):
+        """Run fn(driver, item) on a free driver, retrying on a fresh one after a crash"""
+        for attempt in range(retries + 1):
+            try:
+                with self.driver() as driver:
+                    return fn(driver, item)
+            except Exception as e:
+                if attempt == retries or not is_session_lost(e):
+                    raise
+                logger.warning(f"Driver crashed, retrying: {str(e)}")
+
+    def close(self):
+        """Quit every browser in the pool"""
+        with self.lock:
+            drivers = list(self.slots)
+            self.slots.clear()
+            self.failed_slots.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
@@ -0,0 +1,180 @@
+import argparse
+import json
+import time
+import logging
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from sink import iter_jsonl
+
+logger = logging.getLogger(__name__)
+
+# Columns repeating a few dozen values are stored once per row group as a
+# dictionary, the rows only hold the index
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+VOTE = pa.struct(
+    [
+        ("yes", pa.int32()),
+        ("no", pa.int32()),
+        ("abstain", pa.int32()),
+        ("unanimous", pa.bool_()),
+        ("approved", pa.bool_()),
+        ("rejected", pa.bool_()),
+    ]
+)
+
+READING = pa.struct(
+    [
+        ("reading", pa.string()),
+        ("deposit_date", pa.string()),
+        ("deposit_date_iso", pa.string()),
+        ("commission", pa.string()),
+        ("vote", VOTE),
+    ]
+)
+
+SCHEMAS = {
+    "legislation": pa.schema(
+        [
+            ("category", CATEGORY),
+            ("title", pa.string()),
+            ("url", pa.string()),
+            ("type", CATEGORY),
+            ("date", pa.string()),
+            ("date_iso", pa.string()),
+            ("legislature_period", CATEGORY),
+            ("commission", CATEGORY),
+            ("readings", pa.list_(READING)),
+        ]
+    ),
+    "questions": pa.schema(
+        [
+            ("title", pa.string()),
+            ("date", pa.string()),
+            ("date_iso", pa.string()),
+            ("to", CATEGORY),
+            ("author", pa.string()),
+            ("state", CATEGORY),
+        ]
+    ),
+    "deputies": pa.schema(
+        [
+            ("name", pa.string()),
+            ("party", CATEGORY),
+            ("function", CATEGORY),
+            ("term", CATEGORY),
+            ("language", CATEGORY),
+        ]
+    ),
+}
+
+
+def iter_records(filenames):
+    """Yield (category, record) pairs from JSONL streams or JSON outputs"""
+    for filename in filenames:
+        if filename.endswith(".jsonl"):
+            yield from iter_jsonl([filename])
+            continue
+
+        with open(filename, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get("parliamentarians"), list):
+            data = data["parliamentarians"]
+        if isinstance(data, list):
+            for record in data:
+                yield None, record
+        else:
+            for category, records in data.items():
+                for record in records:
+                    yield category, record
+
+
+def get_row(category, record, schema):
+    """Keep the schema's fields of a record, category included"""
+    row = {field: record.get(field) for field in schema.names}
+    if "category" in schema.names:
+        row["category"] = category
+    return row
+
+
+def iter_batches(filenames, schema, batch_size):
+    batch = []
+    for category, record in iter_records(filenames):
+        batch.append(get_row(category, record, schema))
+        if len(batch) >= batch_size:
+            yield pa.Table.from_pylist(batch, schema=schema)
+            batch = []
+    if batch:
+        yield pa.Table.from_pylist(batch, schema=schema)
+
+
+def export_parquet(filenames, parquet_file, dataset="legislation", batch_size=10000):
+    """Write a dataset to a single Parquet file, one row group per batch"""
+    schema = SCHEMAS[dataset]
+    count = 0
+    with pq.ParquetWriter(parquet_file, schema, compression="zstd") as writer:
+        for table in iter_batches(filenames, schema, batch_size):
+            writer.write_table(table)
+            count += table.num_rows
+
+    logger.info(f"Exported {count} {dataset} records to {parquet_file}")
+    return count
+
+
+def append_partitions(filenames, directory, dataset="legislation", partition_by="legislature_period", batch_size=10000):
+    """Write a dataset to a directory partitioned on a column
+
+    Partitions present in this run (<partition_by>=<value>/ directories) are
+    replaced as a whole, other partitions are kept, so re-exporting a corpus
+    never duplicates rows and the directory can be read back as one table.
+    """
+    schema = SCHEMAS[dataset]
+    count = 0
+
+    def iter_record_batches():
+        nonlocal count
+        for table in iter_batches(filenames, schema, batch_size):
+            count += table.num_rows
+            yield from table.to_batches()
+
+    # One write for the whole run, so a partition is cleared only once,
+    # before its first rows are written
+    ds.write_dataset(
+        iter_record_batches(),
+        directory,
+        schema=schema,
+        format="parquet",
+        partitioning=[partition_by],
+        partitioning_flavor="hive",
+        basename_template=f"part-{int(time.time() * 1000)}-{{i}}.parquet",
+        existing_data_behavior="delete_matching",
+    )
+
+    logger.info(f"Wrote {count} {dataset} records to {directory}")
+    return count
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Export scraped data to Parquet")
+    parser.add_argument("dataset", choices=list(SCHEMAS))
+    parser.add_argument("files", nargs="+", help="JSON outputs or JSONL streams")
+    parser.add_argument("--output", help="Parquet file, or directory with --partition-by")
+    parser.add_argument(
+        "--partition-by",
+        help="Write to a directory partitioned on this column, e.g. legislature_period or term",
+    )
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    if args.partition_by:
+        append_partitions(
+            args.files, args.output or args.dataset, args.dataset, args.partition_by, args.batch_size
+        )
+    else:
+        export_parquet(args.files, args.output or f"{args.dataset}.parquet", args.dataset, args.batch_size)
@@ -0,0 +1,129 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from fake_useragent import UserAgent
+from urllib.parse import urlparse
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Statuses telling the client to slow down; they are retried over HTTP
+THROTTLE_STATUSES = (429, 503)
+THROTTLE_RETRIES = 3
+
+# Markers of anti-bot pages that only resolve after running JavaScript
+JS_CHALLENGE_MARKERS = (
+    "cf-browser-verification",
+    "challenge-platform",
+    "cf_chl_opt",
+    "Just a moment...",
+    "Please enable JavaScript",
+    "Checking your browser",
+)
+
+
+def is_js_challenge(response):
+    """Check whether a response is a JavaScript challenge instead of content"""
+    if response.headers.get("cf-mitigated") == "challenge":
+        return True
+    head = response.text[:5000]
+    return any(marker in head for marker in JS_CHALLENGE_MARKERS)
+
+
+class HttpFetcher:
+    """Plain HTTP client with keep-alive connection pooling and gzip"""
+
+    def __init__(
+        self, pool_size=10, timeout=30, max_per_host=4, cache=None, scheduler=None
+    ):
+        self.timeout = timeout
+        self.cache = cache
+        self.scheduler = scheduler
+        self.max_per_host = max_per_host
+        self.host_slots = {}
+        self.host_slots_lock = threading.Lock()
+        self.session = requests.Session()
+
+        # Throttling (429/503, Retry-After) is handled in fetch() so every
+        # attempt goes through the host slot and the rate scheduler
+        retries = Retry(
+            total=3,
+            backoff_factor=1,
+            status_forcelist=[500, 502, 504],
+            respect_retry_after_header=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.session.headers.update(
+            {
+                "User-Agent": UserAgent().random,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "ar,fr;q=0.9,en;q=0.8",
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+            }
+        )
+
+    def get_host_slot(self, url):
+        """Return the semaphore capping concurrent requests to the URL's host"""
+        host = urlparse(url).netloc
+        with self.host_slots_lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self.host_slots[host]
+
+    def fetch(self, url, url_class="listing"):
+        """Fetch a URL, serving and revalidating it through the cache if any"""
+        cached = self.cache.get(url) if self.cache is not None else None
+        if cached is not None and self.cache.is_fresh(cached, url_class):
+            return cached
+
+        headers = self.cache.validation_headers(cached) if cached is not None else {}
+
+        for attempt in range(THROTTLE_RETRIES + 1):
+            try:
+                with self.get_host_slot(url):
+                    if self.scheduler is not None:
+                        self.scheduler.acquire(url)
+                    start = time.monotonic()
+                    response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                logger.error(f"Error fetching {url}: {str(e)}")
+                if self.scheduler is not None:
+                    self.scheduler.record(url, error=True)
+                raise
+
+            # 429/503 lower the host's rate; the retry then waits for it
+            if self.scheduler is not None:
+                self.scheduler.record(url, response.status_code, time.monotonic() - start)
+            if response.status_code not in THROTTLE_STATUSES or is_js_challenge(response):
+                break
+
+            logger.warning(f"Throttled on {url} ({response.status_code}), attempt {attempt + 1}")
+            if attempt == THROTTLE_RETRIES:
+                continue
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                time.sleep(min(int(retry_after), 60))
+            elif self.scheduler is None:
+                time.sleep(2 ** attempt)
+        else:
+            response.raise_for_status()
+
+        if self.cache is not None:
+            if response.status_code == 304 and cached is not None:
+                self.cache.touch(url)
+                return cached
+            if response.status_code == 200 and not is_js_challenge(response):
+                self.cache.store(url, response.status_code, response.headers, response.content)
+
+        return response
+
+    def close(self):
+        self.session.close()
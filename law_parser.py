@@ -0,0 +1,175 @@
+import argparse
+import json
+import logging
+import os
+import re
+from urllib.parse import unquote, urlsplit
+
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+from cache import ResponseCache
+from utils import clean_text
+from dates import normalize_date
+
+logger = logging.getLogger(__name__)
+
+# Selectors and patterns are compiled once, not per page or per block
+SECTION_SELECTOR = CSSSelector(".dp-section")
+SECTION_TITLE_SELECTOR = CSSSelector(".section-title")
+BLOCK_SELECTOR = CSSSelector(".dp-block")
+BLOCK_LABEL_SELECTOR = CSSSelector(".dp-block-l span")
+BLOCK_DETAIL_SELECTOR = CSSSelector(".dp-block-r span")
+
+YES_PATTERN = re.compile(r"الموافقون\s*[:：]\s*(\d+)")
+NO_PATTERN = re.compile(r"المعارضون\s*[:：]\s*(\d+)")
+ABSTAIN_PATTERN = re.compile(r"الممتنعون\s*[:：]\s*(\d+|لا أحد)")
+
+# Law detail pages: /ar/النصوص-التشريعية/<law slug> (also under /fr/), or
+# /ar/node/<id> for laws without a slug
+LAW_DETAIL_PATTERN = re.compile(r"^/(?:ar|fr)/(?:النصوص-التشريعية/[^/]+|node/\d+)/?$")
+
+
+def is_law_detail_url(url):
+    """Check whether a URL is a law detail page rather than a listing"""
+    parts = urlsplit(url)
+    return not parts.query and LAW_DETAIL_PATTERN.match(unquote(parts.path)) is not None
+
+
+def text_of(element):
+    return clean_text(element.text_content())
+
+
+def parse_vote(vote_text):
+    """Parse the text following 'نتيجة التصويت' into a vote dict"""
+    vote_data = {}
+
+    if "الإجماع" in vote_text:
+        vote_data["unanimous"] = True
+        return vote_data
+
+    yes_match = YES_PATTERN.search(vote_text)
+    if yes_match:
+        vote_data["yes"] = int(yes_match.group(1))
+
+    no_match = NO_PATTERN.search(vote_text)
+    if no_match:
+        vote_data["no"] = int(no_match.group(1))
+
+    abstain_match = ABSTAIN_PATTERN.search(vote_text)
+    if abstain_match:
+        abstain_value = abstain_match.group(1)
+        vote_data["abstain"] = 0 if abstain_value == "لا أحد" else int(abstain_value)
+
+    if "رفضه مجلس النواب" in vote_text:
+        vote_data["rejected"] = True
+    elif "صادقه مجلس النواب" in vote_text:
+        vote_data["approved"] = True
+
+    return vote_data
+
+
+def parse_reading(section):
+    """Parse one .dp-section of a law detail page, or return None"""
+    titles = SECTION_TITLE_SELECTOR(section)
+    if not titles:
+        return None
+    reading_data = {"reading": text_of(titles[0])}
+
+    for block in BLOCK_SELECTOR(section):
+        labels = BLOCK_LABEL_SELECTOR(block)
+        if not labels:
+            continue
+        block_type = text_of(labels[0])
+        details = [text_of(detail) for detail in BLOCK_DETAIL_SELECTOR(block)]
+
+        if "مكتب مجلس النواب" in block_type:
+            for text in details:
+                if "تاريخ إحالته على المجلس" in text:
+                    reading_data["deposit_date"] = text.split(
+                        "تاريخ إحالته على المجلس:"
+                    )[-1].strip()
+                    reading_data["deposit_date_iso"] = normalize_date(
+                        reading_data["deposit_date"]
+                    )
+
+        elif "اللجنة" in block_type:
+            for text in details:
+                if "تمت إحالته على لجنة" in text:
+                    reading_data["commission"] = (
+                        text.split("تمت إحالته على لجنة")[-1].split("في")[0].strip()
+                    )
+
+        elif "الجلسة العامة" in block_type:
+            for text in details:
+                if "نتيجة التصويت" in text:
+                    vote_data = parse_vote(text.split("نتيجة التصويت")[-1].strip())
+                    if vote_data:
+                        reading_data["vote"] = vote_data
+
+    return reading_data if reading_data["reading"] else None
+
+
+def parse_readings(page):
+    """Parse the readings of a law detail page
+
+    page is the page HTML (str or bytes) or an already parsed lxml tree.
+    Each reading has its title and, when present, deposit_date, commission
+    and vote. Empty or unparsable pages have no readings.
+    """
+    if isinstance(page, (str, bytes)):
+        if not page.strip():
+            return []
+        try:
+            tree = lxml.html.fromstring(page)
+        except (etree.ParserError, ValueError) as e:
+            logger.warning(f"Could not parse page: {str(e)}")
+            return []
+    else:
+        tree = page
+    readings = []
+    for section in SECTION_SELECTOR(tree):
+        reading = parse_reading(section)
+        if reading is not None:
+            readings.append(reading)
+    return readings
+
+
+def reparse_corpus(json_file, cache, categories=("projets_de_loi", "propositions_de_loi")):
+    """Re-parse the readings of every law from cached detail pages, offline"""
+    with open(json_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    updated = missing = 0
+    for category in categories:
+        for law in data.get(category, []):
+            cached = cache.get(law["url"])
+            # Keep the current readings when the cached body is unusable
+            if cached is None or cached.status_code != 200 or not cached.content.strip():
+                missing += 1
+                continue
+            law["readings"] = parse_readings(cached.content)
+            updated += 1
+
+    temp_file = f"{json_file}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(temp_file, json_file)
+
+    logger.info(f"Re-parsed {updated} laws, {missing} had no usable cached detail page")
+    return updated
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(
+        description="Re-parse law readings from the response cache without hitting the site"
+    )
+    parser.add_argument("json_file", nargs="?", default="moroccan_legislation_all.json")
+    parser.add_argument("--cache-dir", default=".http_cache")
+    args = parser.parse_args()
+
+    reparse_corpus(args.json_file, ResponseCache(args.cache_dir))
@@ -1,19 +1,83 @@
+import argparse
 from scraper import GenericScraper
-from config import QUESTION_URL
+from cache import ResponseCache
+from scheduler import RateScheduler
+from storage import Storage
+from analytics import update_analytics
+from config import (
+    LAWS_URL,
+    QUESTION_URL,
+    MAX_WORKERS,
+    MAX_PER_HOST,
+    QUESTION_SHARDS,
+    CACHE_DIR,
+    CACHE_TTLS,
+    RATE_LIMIT,
+    BROWSER_POOL_SIZE,
+    DB_FILE,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape the Moroccan Parliament website")
+    parser.add_argument(
+        "--target",
+        choices=["questions", "legislation"],
+        default="questions",
+        help="What to scrape (default: questions)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip pages completed by the previous run and continue from its checkpoint",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only scrape laws missing from the previous legislation output",
+    )
+    parser.add_argument(
+        "--db",
+        nargs="?",
+        const=DB_FILE,
+        help=f"Also upsert the results into a SQLite database (default: {DB_FILE})",
+    )
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+
     # Create scraper instance
-    scraper = GenericScraper(QUESTION_URL)
+    scraper = GenericScraper(
+        QUESTION_URL if args.target == "questions" else LAWS_URL,
+        max_workers=MAX_WORKERS,
+        max_per_host=MAX_PER_HOST,
+        cache=ResponseCache(CACHE_DIR, CACHE_TTLS),
+        scheduler=RateScheduler(**RATE_LIMIT),
+        pool_size=BROWSER_POOL_SIZE,
+        storage=Storage(args.db) if args.db else None,
+    )
 
     try:
         # Start scraping
-        results = scraper.scrape_question()
-        print(f"Scraped {len(results)} laws successfully")
+        if args.target == "questions":
+            results = scraper.scrape_question(QUESTION_SHARDS, resume=args.resume)
+        else:
+            results = scraper.scrape_legislation(
+                incremental=args.incremental, resume=args.resume
+            )
+            if results:
+                # Fold the new and changed laws into the dashboard aggregates
+                update_analytics("moroccan_legislation_all.json")
+        for category, count in results.items():
+            print(f"Scraped {count} {category} successfully")
     except Exception as e:
         print(f"Error during scraping: {str(e)}")
     finally:
         scraper.cleanup()
+        if scraper.storage is not None:
+            scraper.storage.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+import time
+import threading
+import logging
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class HostState:
+    """Token bucket and statistics for one host"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.backoffs = 0
+        self.first_request = None
+        self.last_request = None
+
+
+class RateScheduler:
+    """Per-host token bucket whose rate adapts with AIMD
+
+    Every successful response adds increase requests/second to the host's
+    rate; errors, 429/503 responses and responses slower than slow_threshold
+    seconds multiply it by decrease. Callers wait only as long as the current
+    rate requires instead of sleeping a fixed worst case.
+    """
+
+    def __init__(
+        self,
+        initial_rate=2.0,
+        min_rate=0.2,
+        max_rate=20.0,
+        increase=0.1,
+        decrease=0.5,
+        slow_threshold=5.0,
+        burst=2,
+    ):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_threshold = slow_threshold
+        self.burst = burst
+        self.hosts = {}
+        self.hosts_lock = threading.Lock()
+
+    def get_state(self, url):
+        host = urlparse(url).netloc
+        with self.hosts_lock:
+            if host not in self.hosts:
+                self.hosts[host] = HostState(self.initial_rate, self.burst)
+            return self.hosts[host]
+
+    def acquire(self, url):
+        """Block until a request to the URL's host is allowed"""
+        state = self.get_state(url)
+        with state.lock:
+            now = time.monotonic()
+            state.tokens = min(
+                self.burst, state.tokens + (now - state.updated) * state.rate
+            )
+            state.updated = now
+            # Reserve a token; a negative balance is the wait for this caller
+            state.tokens -= 1
+            wait = -state.tokens / state.rate if state.tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def record(self, url, status=None, elapsed=None, error=False):
+        """Adapt the host's rate to the outcome of a request"""
+        state = self.get_state(url)
+        with state.lock:
+            now = time.monotonic()
+            state.requests += 1
+            state.first_request = state.first_request or now
+            state.last_request = now
+
+            throttled = error or status in (429, 503)
+            slow = elapsed is not None and elapsed > self.slow_threshold
+            if throttled or slow:
+                state.rate = max(self.min_rate, state.rate * self.decrease)
+                state.backoffs += 1
+                logger.info(
+                    f"Backing off {urlparse(url).netloc} to {state.rate:.2f} req/s"
+                )
+            else:
+                state.rate = min(self.max_rate, state.rate + self.increase)
+
+    def report(self):
+        """Return the allowed and achieved request rate of every host"""
+        report = {}
+        with self.hosts_lock:
+            hosts = dict(self.hosts)
+        for host, state in hosts.items():
+            with state.lock:
+                duration = (state.last_request or 0) - (state.first_request or 0)
+                report[host] = {
+                    "requests": state.requests,
+                    "backoffs": state.backoffs,
+                    "allowed_rate": round(state.rate, 2),
+                    "achieved_rate": round(state.requests / duration, 2)
+                    if duration > 0
+                    else None,
+                }
+        return report
+
+    def log_report(self):
+        for host, stats in self.report().items():
+            logger.info(
+                f"{host}: {stats['requests']} requests, "
+                f"{stats['achieved_rate']} req/s achieved, "
+                f"{stats['allowed_rate']} req/s allowed, {stats['backoffs']} backoffs"
+            )
@@ -1,18 +1,36 @@
 import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
-from selenium.webdriver.support.ui import Select
 import time
 import random
 from fake_useragent import UserAgent
 import logging
 import atexit
 import json
-from urllib.parse import unquote
+import re
+from urllib.parse import unquote, urlparse, parse_qs, urlencode, urlunparse
 import os
-from utils import wait_for_element, find_elements, click_element
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
+import requests
+from utils import (
+    element_text,
+    extract_fields_from_tree,
+    wait_until_ready,
+    POLL_INTERVAL,
+    add_lean_options,
+    enable_resource_blocking,
+    get_page_stats,
+    measure_blocking_savings,
+    format_blocking_savings,
+)
+from fetcher import HttpFetcher, is_js_challenge
+from checkpoint import CheckpointJournal
+from sink import JsonlSink, finalize_jsonl
+from law_parser import parse_readings
+from dates import normalize_date
+from scheduler import RateScheduler
+from driver_pool import DriverPool
 
 # Set up logging
 logging.basicConfig(
@@ -20,32 +38,94 @@ logging.basicConfig(
 )
 
 
+# Declarative field specs for the listing cards, see utils.extract_fields
+LAW_CARD_SELECTOR = ".col-md-6.col-lg-4.mb-4"
+
+LAW_CARD_FIELDS = {
+    "url": {"css": "h3.questionss_group a", "attr": "href"},
+    "title": {"css": "h3.questionss_group a p"},
+}
+
+ADOPTED_LAW_CARD_FIELDS = {
+    "url": {"css": "h3.questionss_group a", "attr": "href"},
+    "title": {"css": "h3.questionss_group a"},
+    "commission": {"css": ".lw-link span"},
+}
+
+# Legislature facet labels, e.g. "2021-2026"
+LEGISLATURE_PATTERN = re.compile(r"^\s*(\d{4})\s*-\s*(\d{4})\s*$")
+
+QUESTION_FIELDS = {
+    "title": {"xpath": "./div[1]/div[1]/a"},
+    "date": {"xpath": "./div[1]/div[2]/time", "attr": "datetime"},
+    "to": {"xpath": "./div[1]/div[3]/span", "attr": "tail"},
+    "author": {"xpath": "./div[2]/div[1]/span", "attr": "tail"},
+}
+
+
 class GenericScraper:
-    def __init__(self, base_url):
+    def __init__(
+        self,
+        base_url,
+        fetch_backend="http",
+        max_workers=8,
+        max_per_host=4,
+        cache=None,
+        scheduler=None,
+        lean_browser=True,
+        user_data_dir=".browser_profile",
+        pool_size=4,
+        storage=None,
+    ):
         self.base_url = base_url
-        self.driver = None
+        self.storage = storage
+        self.pool_size = pool_size
+        self.lean_browser = lean_browser
+        self.user_data_dir = user_data_dir
+        self.browser_stats = {"pages": 0, "transfer_bytes": 0, "load_ms": 0, "blocked": 0}
+        self.stats_lock = threading.Lock()
+        # Page types whose resource blocking was measured against a baseline load
+        self.measured_page_types = set()
+        self.cache = cache
+        self.scheduler = scheduler if scheduler is not None else RateScheduler()
+        self.journal = None
+        self.driver_pool = None
+        self.driver_pool_lock = threading.Lock()
+        self.max_workers = max_workers
+        self.fetch_backend = fetch_backend
+        self.fetcher = (
+            HttpFetcher(
+                pool_size=max_workers,
+                max_per_host=max_per_host,
+                cache=cache,
+                scheduler=self.scheduler,
+            )
+            if fetch_backend == "http"
+            else None
+        )
         self.logger = logging.getLogger(__name__)
         atexit.register(self.cleanup)
 
     def cleanup(self):
         """Safely cleanup driver resources"""
         try:
-            if hasattr(self, "driver") and self.driver is not None:
+            if getattr(self, "fetcher", None) is not None:
+                self.fetcher.close()
+            if getattr(self, "journal", None) is not None:
+                self.journal.close()
+            if getattr(self, "driver_pool", None) is not None:
                 self.logger.info("Cleaning up driver resources...")
-                try:
-                    self.driver.close()
-                except Exception:
-                    pass
-                try:
-                    self.driver.quit()
-                except Exception:
-                    pass
-                self.driver = None
+                self.driver_pool.close()
+                self.driver_pool = None
         except Exception as e:
             self.logger.error(f"Error during cleanup: {str(e)}")
 
-    def get_driver(self):
-        """Initialize and return an undetected Chrome driver"""
+    def get_driver(self, slot=0):
+        """Initialize and return an undetected Chrome driver
+
+        Each pool slot gets its own user-data dir, since Chrome locks the
+        profile directory of a running browser.
+        """
         try:
             options = uc.ChromeOptions()
 
@@ -68,34 +148,160 @@ class GenericScraper:
             random_size = random.choice(window_sizes)
             options.add_argument(f"--window-size={random_size[0]},{random_size[1]}")
 
+            # Headless, no extensions, no background traffic, warm profile
+            if self.lean_browser:
+                add_lean_options(
+                    options, os.path.abspath(os.path.join(self.user_data_dir, str(slot)))
+                )
+
             driver = uc.Chrome(options=options,version_main=130)
             driver.set_page_load_timeout(random.randint(30, 40))
 
+            if self.lean_browser:
+                enable_resource_blocking(driver)
+
             return driver
 
         except Exception as e:
             self.logger.error(f"Failed to initialize driver: {str(e)}")
             raise
 
-    def wait_for_page_load(self):
-        """Wait for page to load with random delays"""
+    def get_driver_pool(self):
+        """Return the browser pool, launching it on first use"""
+        with self.driver_pool_lock:
+            if self.driver_pool is None:
+                self.driver_pool = DriverPool(self.get_driver, self.pool_size).start()
+            return self.driver_pool
+
+    def wait_for_page_load(self, driver):
+        """Wait for page to load"""
         try:
-            time.sleep(random.uniform(2, 4))
-            WebDriverWait(self.driver, 30).until(
+            WebDriverWait(driver, 30, poll_frequency=POLL_INTERVAL).until(
                 lambda d: d.execute_script("return document.readyState") == "complete"
             )
-            time.sleep(random.uniform(1, 3))
         except Exception as e:
             self.logger.error(f"Error while waiting for page load: {str(e)}")
             raise
 
-    def get_legislation_links(self):
-        """Get links for different types of legislation"""
+    def fetch_page(self, url, url_class="listing", page_type=None):
+        """Fetch a page and return its parsed HTML tree
+
+        page_type names the readiness profile used if the page has to be
+        rendered in the browser (see utils.READINESS_PROFILES).
+        """
+        if self.fetcher is not None:
+            try:
+                response = self.fetcher.fetch(url, url_class)
+                if not is_js_challenge(response):
+                    return self.parse_html(response.content, response.url)
+                self.logger.warning(f"JS challenge on {url}, falling back to browser")
+            except requests.HTTPError:
+                # Still throttled after backing off, a browser would only add load
+                raise
+            except requests.RequestException as e:
+                self.logger.warning(
+                    f"HTTP fetch failed for {url}, falling back to browser: {str(e)}"
+                )
+
+        elif self.cache is not None:
+            cached = self.cache.get_fresh(url, url_class)
+            if cached is not None:
+                return self.parse_html(cached.content, cached.url)
+
+        return self.fetch_page_with_driver(url, page_type)
+
+    def fetch_page_with_driver(self, url, page_type=None):
+        """Load a page in a pooled Chrome driver and return its parsed HTML tree"""
+        html, current_url = self.get_driver_pool().call(
+            lambda driver, url: self.load_in_driver(driver, url, page_type), url
+        )
+
+        if self.cache is not None:
+            self.cache.store(url, 200, {}, html.encode("utf-8"))
+        return self.parse_html(html, current_url)
+
+    def load_in_driver(self, driver, url, page_type=None):
+        """Load a page in the given driver and return its HTML and final URL"""
+        if self.lean_browser:
+            self.log_blocking_savings(driver, url, page_type)
+        # Pace browser loads with the same per-host scheduler as HTTP fetches
+        self.scheduler.acquire(url)
+        start = time.monotonic()
+        try:
+            driver.get(url)
+            # Proceed as soon as the page's content is there
+            if page_type is not None:
+                wait_until_ready(driver, page_type)
+            else:
+                self.wait_for_page_load(driver)
+        except Exception:
+            self.scheduler.record(url, error=True)
+            raise
+        self.scheduler.record(url, elapsed=time.monotonic() - start)
+        self.record_browser_stats(driver, url)
+        return driver.page_source, driver.current_url
+
+    def log_blocking_savings(self, driver, url, page_type=None):
+        """Log, once per page type, what resource blocking saves over an unblocked load"""
+        with self.stats_lock:
+            if page_type in self.measured_page_types:
+                return
+            self.measured_page_types.add(page_type)
+
+        try:
+            # Both measurement loads are paced like any other browser load
+            self.scheduler.acquire(url)
+            self.scheduler.acquire(url)
+            baseline, blocked = measure_blocking_savings(driver, url)
+        except Exception as e:
+            self.logger.warning(f"Could not measure resource blocking on {url}: {str(e)}")
+            return
+        self.logger.info(f"Resource blocking on {url}: {format_blocking_savings(baseline, blocked)}")
+
+    def record_browser_stats(self, driver, url):
+        """Log and accumulate the transfer size and load time of a browser page"""
         try:
-            wait_for_element(
-                self.driver, By.CSS_SELECTOR, ".dropdown-menu.multi-column.columns-3"
+            stats = get_page_stats(driver)
+        except Exception as e:
+            self.logger.warning(f"Could not read page stats for {url}: {str(e)}")
+            return
+
+        with self.stats_lock:
+            self.browser_stats["pages"] += 1
+            self.browser_stats["transfer_bytes"] += stats["transfer_bytes"]
+            self.browser_stats["load_ms"] += stats["load_ms"] or 0
+            self.browser_stats["blocked"] += stats["blocked"]
+        self.logger.info(
+            f"Browser loaded {url}: {stats['transfer_bytes'] / 1024:.0f} KB in "
+            f"{stats['load_ms']} ms, {stats['blocked']} requests blocked"
+        )
+
+    def log_browser_stats(self):
+        pages = self.browser_stats["pages"]
+        if pages:
+            self.logger.info(
+                f"Browser pages: {pages}, "
+                f"{self.browser_stats['transfer_bytes'] / pages / 1024:.0f} KB and "
+                f"{self.browser_stats['load_ms'] / pages:.0f} ms per page on average, "
+                f"{self.browser_stats['blocked']} requests blocked"
             )
 
+    def parse_html(self, html, url):
+        """Parse an HTML document and make its links absolute"""
+        tree = lxml.html.fromstring(html, base_url=url)
+        tree.make_links_absolute(url)
+        return tree
+
+    def get_next_page_url(self, tree):
+        """Return the URL of the 'next' pagination link, or None"""
+        next_links = tree.xpath(
+            "//a[@class='page-link' and contains(text(), 'التالي')]/@href"
+        )
+        return next_links[0] if next_links else None
+
+    def get_legislation_links(self, tree):
+        """Get links for different types of legislation"""
+        try:
             self.legislation_links = {
                 "projets": None,
                 "propositions": None,
@@ -103,24 +309,17 @@ class GenericScraper:
                 "last_page": None,
             }
 
-            legislation_dropdown = self.driver.find_element(
-                By.XPATH, "//a[contains(text(), 'التشريع')]/following-sibling::div"
-            )
-            links = legislation_dropdown.find_elements(
-                By.CSS_SELECTOR, "ul.multi-column-dropdown li a"
+            links = tree.xpath(
+                "//a[contains(text(), 'التشريع')]/following-sibling::div"
+                "//ul[contains(@class, 'multi-column-dropdown')]//li/a"
             )
 
             for link in links:
                 try:
-                    href = link.get_attribute("href")
-                    text = link.get_attribute("innerText").strip()
+                    href = link.get("href")
+                    text = link.text_content().strip()
                     self.logger.info(f"Found link: {text} -> {href}")
 
-                    self.logger.info(
-                        f"Expected text: مشاريع القوانين, مقترحات القوانين, النصوص المصادق عليها"
-                    )
-                    self.logger.info(f"Extracted text: {text}")
-
                     if "مشاريع القوانين" in text:
                         self.legislation_links["projets"] = href
                         self.logger.info(f"Found projets link: {href}")
@@ -135,529 +334,579 @@ class GenericScraper:
                     self.logger.error(f"Error processing link: {str(e)}")
                     continue
 
-            # self.logger.info(f"Found links: {self.legislation_links}")
             return self.legislation_links
 
         except Exception as e:
             self.logger.error(f"Error in get_legislation_links: {str(e)}")
             return {}
 
-    def extract_law_info(self, law_type):
-        """Extract law information with simplified output format"""
+    def extract_law_info(self, law_type, listing_url, known_laws=None):
+        """Extract law information with simplified output format
+
+        With known_laws (url -> record from a previous run), only new laws and
+        laws whose title changed are returned, and pagination stops at the
+        first page whose laws are all already known.
+        """
         laws = []
         current_page = 1
+        page_url = listing_url
+        stream = f"{law_type}_listing"
+
+        if self.journal is not None and self.journal.has_completed_pages(stream):
+            laws.extend(self.journal.get_records(stream))
+            current_page = self.journal.count_completed(stream) + 1
+            page_url = self.journal.get_cursor(stream)
+            self.logger.info(f"Resuming {law_type} listing at page {current_page}")
 
-        while True:
+        while page_url:
             self.logger.info(f"Scraping page {current_page} for {law_type}")
 
             try:
-                wait_for_element(
-                    self.driver, By.CSS_SELECTOR, ".col-md-6.col-lg-4.mb-4", timeout=20
-                )
-                current_page_url = self.driver.current_url
-                law_items = find_elements(
-                    self.driver, By.CSS_SELECTOR, ".col-md-6.col-lg-4.mb-4"
-                )
+                tree = self.fetch_page(page_url, page_type="law_listing")
+                cards = extract_fields_from_tree(tree, LAW_CARD_SELECTOR, LAW_CARD_FIELDS)
 
-                if not law_items:
+                if not cards:
                     self.logger.warning(f"No law items found on page {current_page}")
                     break
 
                 page_laws = []
-                for item in law_items:
-                    try:
-                        law_details = {"type": law_type, "readings": []}
-
-                        link_element = item.find_element(
-                            By.CSS_SELECTOR, "h3.questionss_group a"
-                        )
-                        law_url = link_element.get_attribute("href")
-                        law_title = link_element.find_element(
-                            By.CSS_SELECTOR, "p"
-                        ).text.strip()
-
-                        law_details.update({"title": law_title, "url": law_url})
-
-                        page_laws.append(law_details)
-
-                    except Exception as e:
-                        self.logger.error(f"Error extracting basic law info: {str(e)}")
+                for card in cards:
+                    if card["url"] is None or card["title"] is None:
+                        self.logger.error("Error extracting basic law info: missing link")
                         continue
 
-                for law in page_laws:
-                    try:
-                        # self.logger.info(f"Navigating to law page: {law['url']}")
-                        self.driver.get(law["url"])
-                        self.wait_for_page_load()
-                        time.sleep(random.uniform(2, 3))
+                    page_laws.append(
+                        {
+                            "type": law_type,
+                            "readings": [],
+                            "title": card["title"],
+                            "url": card["url"],
+                        }
+                    )
 
-                        reading_sections = find_elements(
-                            self.driver, By.CSS_SELECTOR, ".dp-section"
+                if known_laws is not None:
+                    page_laws = self.filter_known_laws(page_laws, known_laws, ("title",))
+                    if not page_laws:
+                        self.logger.info(
+                            f"Page {current_page} is already known, stopping."
                         )
+                        break
 
-                        for section in reading_sections:
-                            reading_data = {}
-
-                            try:
-                                reading_title = section.find_element(
-                                    By.CSS_SELECTOR, ".section-title"
-                                ).text.strip()
-                                reading_data["reading"] = reading_title
-                            except NoSuchElementException:
-                                continue
-
-                            blocks = section.find_elements(By.CSS_SELECTOR, ".dp-block")
-
-                            for block in blocks:
-                                try:
-                                    block_type = block.find_element(
-                                        By.CSS_SELECTOR, ".dp-block-l span"
-                                    ).text.strip()
-                                    details = block.find_elements(
-                                        By.CSS_SELECTOR, ".dp-block-r span"
-                                    )
-
-                                    if "مكتب مجلس النواب" in block_type:
-                                        for detail in details:
-                                            text = detail.text.strip()
-                                            if "تاريخ إحالته على المجلس" in text:
-                                                reading_data["deposit_date"] = (
-                                                    text.split(
-                                                        "تاريخ إحالته على المجلس:"
-                                                    )[-1].strip()
-                                                )
-
-                                    elif "اللجنة" in block_type:
-                                        for detail in details:
-                                            text = detail.text.strip()
-                                            if "تمت إحالته على لجنة" in text:
-                                                commission_name = (
-                                                    text.split("تمت إحالته على لجنة")[
-                                                        -1
-                                                    ]
-                                                    .split("في")[0]
-                                                    .strip()
-                                                )
-                                                reading_data["commission"] = (
-                                                    commission_name
-                                                )
-
-                                    elif "الجلسة العامة" in block_type:
-                                        for detail in details:
-                                            text = detail.text.strip()
-                                            if "نتيجة التصويت" in text:
-                                                vote_data = {}
-                                                vote_text = text.split("نتيجة التصويت")[
-                                                    -1
-                                                ].strip()
-
-                                                if "الإجماع" in vote_text:
-                                                    vote_data["unanimous"] = True
-                                                else:
-                                                    import re
-
-                                                    yes_match = re.search(
-                                                        r"الموافقون\s*[:：]\s*(\d+)",
-                                                        vote_text,
-                                                    )
-                                                    if yes_match:
-                                                        vote_data["yes"] = int(
-                                                            yes_match.group(1)
-                                                        )
-
-                                                    no_match = re.search(
-                                                        r"المعارضون\s*[:：]\s*(\d+)",
-                                                        vote_text,
-                                                    )
-                                                    if no_match:
-                                                        vote_data["no"] = int(
-                                                            no_match.group(1)
-                                                        )
-
-                                                    abstain_match = re.search(
-                                                        r"الممتنعون\s*[:：]\s*(\d+|لا أحد)",
-                                                        vote_text,
-                                                    )
-                                                    if abstain_match:
-                                                        abstain_value = (
-                                                            abstain_match.group(1)
-                                                        )
-                                                        vote_data["abstain"] = (
-                                                            0
-                                                            if abstain_value == "لا أحد"
-                                                            else int(abstain_value)
-                                                        )
-
-                                                    if "رفضه مجلس النواب" in vote_text:
-                                                        vote_data["rejected"] = True
-                                                    elif (
-                                                        "صادقه مجلس النواب" in vote_text
-                                                    ):
-                                                        vote_data["approved"] = True
-
-                                                if vote_data:
-                                                    reading_data["vote"] = vote_data
-
-                                except NoSuchElementException:
-                                    continue
-
-                            if reading_data.get("reading"):
-                                law["readings"].append(reading_data)
-
-                        laws.append(law)
-
-                    except Exception as e:
-                        self.logger.error(f"Error processing law details: {str(e)}")
-                        laws.append(law)
-                        continue
+                laws.extend(page_laws)
 
-                    finally:
-                        self.driver.get(current_page_url)
-                        self.wait_for_page_load()
-                        time.sleep(random.uniform(1, 2))
+                page_url = self.get_next_page_url(tree)
 
-                try:
-                    next_button = self.driver.find_element(
-                        By.XPATH,
-                        "//a[@class='page-link' and contains(text(), 'التالي')]",
-                    )
-                    if not next_button.is_enabled():
-                        break
-                    next_button.click()
+                if self.journal is not None:
+                    for law in page_laws:
+                        self.journal.add_record(stream, current_page, law)
+                    self.journal.complete_page(stream, current_page, page_url)
+
+                if page_url:
                     current_page += 1
-                    self.wait_for_page_load()
-                    time.sleep(random.uniform(1, 2))
-                except NoSuchElementException:
+                else:
                     self.logger.info("No more pages to navigate.")
-                    break
-                except Exception as e:
-                    self.logger.error(f"Error navigating to next page: {str(e)}")
-                    break
 
             except Exception as e:
                 self.logger.error(f"Error processing page {current_page}: {str(e)}")
                 break
 
+        self.logger.info(f"Fetching details for {len(laws)} {law_type} laws")
+        return self.fetch_law_details(laws)
+
+    def fetch_law_readings(self, law):
+        """Fetch a law detail page and attach its readings to the law"""
+        stream = f"{law['type']}_details"
+        if self.journal is not None and self.journal.is_completed(stream, law["url"]):
+            return self.journal.get_records(stream, law["url"])[0]
+
+        try:
+            law_tree = self.fetch_page(law["url"], "detail", "law_detail")
+            law["readings"] = parse_readings(law_tree)
+        except Exception as e:
+            self.logger.error(f"Error processing law details: {str(e)}")
+            return law
+
+        if self.journal is not None:
+            self.journal.add_record(stream, law["url"], law)
+            self.journal.complete_page(stream, law["url"])
+        return law
+
+    def fetch_law_details(self, laws):
+        """Fetch the detail pages of several laws concurrently, yielding them in listing order"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from executor.map(self.fetch_law_readings, laws)
+
+    def extract_adopted_law_info(self, adopted_laws_link, known_laws=None):
+        """Scrape adopted laws as independent legislature x year x nature shards
+
+        Laws without a year or nature value, or with a year outside their
+        legislature, belong to no shard. When the shards of a legislature
+        found fewer laws than its unfiltered listing holds, that listing is
+        crawled as well and merged by URL.
+        """
+        all_shards = self.get_adopted_law_shards(adopted_laws_link)
+        shards = [shard for shard in all_shards if not shard.get("fallback")]
+        fallbacks = [shard for shard in all_shards if shard.get("fallback")]
+        self.logger.info(f"Scraping adopted laws in {len(shards)} shards")
+
+        def scrape(shard):
+            return self.scrape_adopted_law_shard(shard, known_laws)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            shard_laws = list(executor.map(scrape, shards))
+
+            found = {}
+            for shard, laws in zip(shards, shard_laws):
+                found.setdefault(shard["legislature_period"], set()).update(
+                    law["url"] for law in laws
+                )
+            expected = list(executor.map(self.count_listing, (f["url"] for f in fallbacks)))
+            missing = []
+            for fallback, count in zip(fallbacks, expected):
+                found_count = len(found.get(fallback["legislature_period"], ()))
+                if count is None or found_count < count:
+                    self.logger.info(
+                        f"Shards of {fallback['legislature_period']} found {found_count} of "
+                        f"{count} laws, crawling its unfiltered listing"
+                    )
+                    missing.append(fallback)
+            shard_laws += list(executor.map(scrape, missing))
+
+        # A law listed under several facet values is kept once
+        laws = []
+        seen_urls = set()
+        for shard in shard_laws:
+            for law in shard:
+                if law["url"] not in seen_urls:
+                    seen_urls.add(law["url"])
+                    laws.append(law)
+
         return laws
 
-    def extract_adopted_law_info(self, adopted_laws_link):
+    def scrape_adopted_law_shard(self, shard, known_laws=None):
+        """Walk the pages of one facet shard of the adopted laws listing"""
         laws = []
-        legislature_links = self.get_legislature_links(adopted_laws_link)
+        legislature_period = shard["legislature_period"]
+        current_page = 1
+        last_date = None
+        page_url = shard["url"]
+        stream = f"adopted_{legislature_period}_{shard['year']}_{shard['nature']}"
 
-        for legislature_period, legislature_link in legislature_links.items():
-            self.logger.info(
-                f"Scraping adopted laws for legislature period {legislature_period}"
-            )
-            self.driver.get(legislature_link)
-            self.wait_for_page_load()
+        if self.journal is not None and self.journal.has_completed_pages(stream):
+            laws.extend(self.journal.get_records(stream))
+            current_page = self.journal.count_completed(stream) + 1
+            cursor = self.journal.get_cursor(stream)
+            page_url, last_date = cursor["url"], cursor["last_date"]
+            self.logger.info(f"Resuming shard {stream} at page {current_page}")
 
-            current_page = 1
-            last_date = None
+        while page_url:
+            self.logger.info(f"Scraping shard {stream}, page {current_page}")
 
-            while True:
-                self.logger.info(f"Scraping page {current_page}")
+            try:
+                tree = self.fetch_page(page_url, page_type="law_listing")
+            except Exception as e:
+                self.logger.error(f"Error loading page {current_page}: {str(e)}")
+                break
 
-                wait_for_element(
-                    self.driver, By.CSS_SELECTOR, ".col-md-6.col-lg-4.mb-4"
-                )
+            # Cards above the page's first date continue the previous page's group
+            card_dates = self.get_card_dates(tree, last_date)
+            date_elements = tree.cssselect("h2.sorting_date")
 
-                date_elements = find_elements(
-                    self.driver, By.CSS_SELECTOR, "h2.sorting_date"
-                )
+            if date_elements:
+                last_date = element_text(date_elements[-1])
 
-                if date_elements:
-                    last_date = date_elements[-1].text.strip()
+            cards = extract_fields_from_tree(
+                tree, LAW_CARD_SELECTOR, ADOPTED_LAW_CARD_FIELDS
+            )
+            page_laws = []
 
-                law_items = find_elements(
-                    self.driver, By.CSS_SELECTOR, ".col-md-6.col-lg-4.mb-4"
-                )
+            for card, card_date in zip(cards, card_dates):
+                href = card["url"]
+                title = card["title"]
 
-                for item in law_items:
+                if not title and href:
                     try:
-                        link_element = item.find_element(
-                            By.CSS_SELECTOR, "h3.questionss_group a"
-                        )
-                        href = link_element.get_attribute("href")
-                        title = link_element.text.strip()
-
-                        if not title and href:
-                            try:
-                                encoded_title = href.split("/")[-1]
-                                title = unquote(encoded_title)
-                            except:
-                                title = "Unknown Title"
-
-                        commission_element = item.find_element(
-                            By.CSS_SELECTOR, ".lw-link span"
-                        )
-                        commission = (
-                            commission_element.text.strip()
-                            if commission_element
-                            else "Unknown Commission"
-                        )
-
-                        if href and title:
-                            laws.append(
-                                {
-                                    "title": title,
-                                    "url": href,
-                                    "date": last_date,
-                                    "legislature_period": legislature_period,
-                                    "commission": commission,
-                                }
-                            )
-
-                    except Exception as e:
-                        self.logger.error(
-                            f"Error extracting adopted law info: {str(e)}"
-                        )
-                        continue
+                        encoded_title = href.split("/")[-1]
+                        title = unquote(encoded_title)
+                    except:
+                        title = "Unknown Title"
+
+                commission = (
+                    card["commission"]
+                    if card["commission"] is not None
+                    else "Unknown Commission"
+                )
 
-                try:
-                    next_page_link = self.driver.find_element(
-                        By.XPATH,
-                        "//a[@class='page-link' and contains(text(), 'التالي')]",
+                if href and title:
+                    page_laws.append(
+                        {
+                            "title": title,
+                            "url": href,
+                            "date": card_date,
+                            "date_iso": normalize_date(card_date),
+                            "legislature_period": legislature_period,
+                            "commission": commission,
+                        }
                     )
-                    next_page_link.click()
-                    current_page += 1
-                    self.wait_for_page_load()
-                except NoSuchElementException:
-                    self.logger.info("No more pages to navigate.")
-                    break
-                except Exception as e:
-                    self.logger.error(f"Error navigating to the next page: {str(e)}")
+                else:
+                    self.logger.error("Error extracting adopted law info: missing link")
+
+            if known_laws is not None and page_laws:
+                # Dates of cards straddling a page break depend on where the
+                # pages split, so they are not compared
+                page_laws = self.filter_known_laws(
+                    page_laws, known_laws, ("title", "commission")
+                )
+                if not page_laws:
+                    self.logger.info(f"Page {current_page} is already known, stopping.")
                     break
 
+            laws.extend(page_laws)
+
+            page_url = self.get_next_page_url(tree)
+
+            if self.journal is not None:
+                for law in page_laws:
+                    self.journal.add_record(stream, current_page, law)
+                self.journal.complete_page(
+                    stream, current_page, {"url": page_url, "last_date": last_date}
+                )
+
+            if page_url:
+                current_page += 1
+
         return laws
 
-    def get_legislature_links(self, adopted_laws_link):
-        """Get links for different legislature periods"""
+    def get_card_dates(self, tree, previous_date=None):
+        """Return the date of each law card: the nearest h2.sorting_date above it
+
+        The listing groups cards under date headings; previous_date is the
+        group a page starts in when its first card comes before any heading.
+        """
+        dates = []
+        current_date = previous_date
+        for element in tree.cssselect(f"h2.sorting_date, {LAW_CARD_SELECTOR}"):
+            if element.tag == "h2" and "sorting_date" in element.get("class", "").split():
+                current_date = element_text(element)
+            else:
+                dates.append(current_date)
+        return dates
+
+    def get_facet_options(self, tree, name):
+        """Return {label: value} for the options of a listing filter select"""
+        return {
+            option.text_content().strip(): option.get("value")
+            for option in tree.cssselect(f"select[name='{name}'] option")
+            if option.get("value") and option.get("value") != "All"
+        }
+
+    def count_listing(self, url):
+        """Count the cards of a listing from its first and last pages, None on failure"""
         try:
-            wait_for_element(
-                self.driver, By.CSS_SELECTOR, ".dropdown-menu.multi-column.columns-3"
+            tree = self.fetch_page(url, page_type="law_listing")
+            page_size = len(tree.cssselect(LAW_CARD_SELECTOR))
+            last_page = self.get_last_page_number(tree)
+            if last_page == 0:
+                return page_size
+            last_tree = self.fetch_page(
+                self.get_page_url(url, last_page), page_type="law_listing"
             )
+            return last_page * page_size + len(last_tree.cssselect(LAW_CARD_SELECTOR))
+        except Exception as e:
+            self.logger.error(f"Error counting {url}: {str(e)}")
+            return None
+
+    def get_adopted_law_shard(self, adopted_laws_link, legislature, year, nature):
+        """Return the shard of the listing filtered on (label, value) facet pairs"""
+        return {
+            "legislature_period": legislature[0],
+            "year": year[0],
+            "nature": nature[0],
+            "url": (
+                f"{adopted_laws_link}?body_value="
+                f"&field_legislature_target_id_1={legislature[1]}"
+                f"&field_annee_legislative_target_id={year[1]}"
+                f"&field_nature_loi_target_id={nature[1]}"
+            ),
+        }
+
+    def get_adopted_law_shards(self, adopted_laws_link):
+        """Split the adopted laws listing into legislature x year x nature shards
+
+        Each legislature also gets its unfiltered listing as a shard marked
+        "fallback", unless its only shard is that listing already.
+        """
+        try:
+            tree = self.fetch_page(adopted_laws_link, page_type="law_listing")
+        except Exception as e:
+            self.logger.error(f"Error getting adopted law facets: {str(e)}")
+            return []
 
-            legislature_links = {}
-
-            legislature_dropdown = self.driver.find_element(
-                By.CSS_SELECTOR, "select[name='field_legislature_target_id_1']"
+        legislatures = self.get_facet_options(tree, "field_legislature_target_id_1")
+        years = self.get_facet_options(tree, "field_annee_legislative_target_id")
+        natures = self.get_facet_options(tree, "field_nature_loi_target_id") or {
+            "All": "All"
+        }
+
+        shards = []
+        for legislature_period, legislature_value in legislatures.items():
+            match = LEGISLATURE_PATTERN.match(legislature_period)
+            if match is None:
+                self.logger.warning(f"Skipping unrecognized legislature: {legislature_period}")
+                continue
+            start_year, end_year = match.groups()
+            if int(start_year) < 2011:
+                continue
+
+            # Only legislative years that fall within the legislature
+            legislature_years = {
+                label: value
+                for label, value in years.items()
+                if not label[:4].isdigit()
+                or int(start_year) <= int(label[:4]) < int(end_year)
+            } or {"All": "All"}
+
+            legislature = (legislature_period, legislature_value)
+            legislature_shards = [
+                self.get_adopted_law_shard(adopted_laws_link, legislature, year, nature)
+                for year in legislature_years.items()
+                for nature in natures.items()
+            ]
+            fallback = self.get_adopted_law_shard(
+                adopted_laws_link, legislature, ("All", "All"), ("All", "All")
             )
-            legislature_select = Select(legislature_dropdown)
-
-            for option in legislature_select.options:
-                option_text = option.text.strip()
-                option_value = option.get_attribute("value")
-                if option_value:
-                    year = int(option_text.split("-")[0])
-                    if year >= 2011:
-                        current_url = f"{adopted_laws_link}?body_value=&field_legislature_target_id_1={option_value}&field_annee_legislative_target_id=All&field_nature_loi_target_id=All"
-                        legislature_links[option_text] = current_url
+            if [shard["url"] for shard in legislature_shards] != [fallback["url"]]:
+                legislature_shards.append(dict(fallback, fallback=True))
+            shards += legislature_shards
 
-            return legislature_links
+        return shards
 
-        except Exception as e:
-            self.logger.error(f"Error getting legislature links: {str(e)}")
-            return {}
-
-    def save_to_json(self, data, filename):
-        """Save the scraped data to a JSON file"""
+    def load_url_index(self, filename):
+        """Load a previous output file as {category: {url: record}}"""
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            self.logger.info(f"Data successfully saved to {filename}")
-        except Exception as e:
-            self.logger.error(f"Error saving to JSON: {str(e)}")
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"No previous data loaded from {filename}: {str(e)}")
+            return {}
 
-    def scrape_legislation(self):
+        return {
+            category: {record["url"]: record for record in records if "url" in record}
+            for category, records in data.items()
+        }
+
+    def filter_known_laws(self, laws, known_laws, fields):
+        """Keep the laws that are new or whose listing fields changed"""
+        return [
+            law
+            for law in laws
+            if law["url"] not in known_laws
+            or any(law.get(f) != known_laws[law["url"]].get(f) for f in fields)
+        ]
+
+    def merge_laws(self, new_laws, known_laws):
+        """Yield freshly scraped laws followed by the previously known ones"""
+        new_urls = set()
+        for law in new_laws:
+            new_urls.add(law["url"])
+            yield law
+
+        for url, law in known_laws.items():
+            if url not in new_urls:
+                yield law
+
+    def scrape_legislation(
+        self,
+        incremental=False,
+        previous_file="moroccan_legislation_all.json",
+        resume=False,
+        journal_file="moroccan_legislation.journal.jsonl",
+        stream_file="moroccan_legislation.jsonl",
+    ):
         try:
             self.logger.info("Starting scraping process...")
+            self.journal = CheckpointJournal(journal_file, resume)
 
-            if self.driver is None:
-                self.driver = self.get_driver()
+            # In incremental mode only new or changed laws are scraped and then
+            # merged into the previous output
+            previous = self.load_url_index(previous_file) if incremental else {}
+
+            def known(category):
+                return previous.get(category, {}) if incremental else None
 
             self.logger.info(f"Accessing URL: {self.base_url}")
-            self.driver.get(self.base_url)
-            self.wait_for_page_load()
+            tree = self.fetch_page(self.base_url, page_type="home")
 
-            links = self.get_legislation_links()
+            links = self.get_legislation_links(tree)
             self.logger.info(f"Found links: {links}")
 
-            all_laws = {}
-
-            if links.get("projets"):
-                self.driver.get(links["projets"])
-                self.wait_for_page_load()
-
-                laws = self.extract_law_info("projets")
-
-                if laws:
-                    all_laws["projets_de_loi"] = laws
-                    self.save_to_json(
-                        {"projets_de_loi": laws}, "moroccan_legislation.json"
-                    )
-
-            if links.get("propositions"):
-                self.driver.get(links["propositions"])
-                self.wait_for_page_load()
-
-                laws = self.extract_law_info("propositions")
-
-                if laws:
-                    all_laws["propositions_de_loi"] = laws
-                    self.save_to_json(
-                        {"propositions_de_loi": laws}, "moroccan_legislation.json"
-                    )
-
-            if links.get("adopted"):
-                self.driver.get(links["adopted"])
-                self.wait_for_page_load()
-
-                laws = self.extract_adopted_law_info(links["adopted"])
-                if laws:
-                    all_laws["textes_de_loi"] = laws
-                    self.save_to_json(
-                        {"textes_de_loi": laws}, "moroccan_legislation.json"
+            # Laws are streamed to JSONL as they are extracted, then the nested
+            # JSON layout is built from the stream
+            sink = JsonlSink(stream_file)
+            try:
+                sections = [
+                    ("projets_de_loi", "projets", self.extract_law_info),
+                    ("propositions_de_loi", "propositions", self.extract_law_info),
+                ]
+                for category, link_key, extract in sections:
+                    if links.get(link_key):
+                        laws = extract(link_key, links[link_key], known(category))
+                        for law in self.merge_laws(laws, previous.get(category, {})):
+                            sink.write(category, law)
+
+                if links.get("adopted"):
+                    laws = self.extract_adopted_law_info(
+                        links["adopted"], known("textes_de_loi")
                     )
+                    for law in self.merge_laws(laws, previous.get("textes_de_loi", {})):
+                        sink.write("textes_de_loi", law)
+            finally:
+                sink.close()
 
-            if all_laws:
-                self.save_to_json(all_laws, "moroccan_legislation_all.json")
-
-            return all_laws
+            self.scheduler.log_report()
+            self.log_browser_stats()
+            if self.storage is not None:
+                self.storage.load_jsonl([stream_file])
+            return finalize_jsonl([stream_file], "moroccan_legislation_all.json")
 
         except Exception as e:
             self.logger.error(f"Error in scraping process: {str(e)}")
-            return []
+            return {}
         finally:
             self.cleanup()
 
-    def extract_question_item(self,item,state):
-
-        link_element = item.find_elements(
-                        By.XPATH, "./div[1]/div"
-                    )
-        #print(item.get_attribute("innerHTML"))
-                    
-        title = link_element[0].find_element(
-                        By.XPATH, "./a"
-                    ).text
-        date = link_element[1].find_element(
-                        By.XPATH, "./time"
-                    ).get_attribute("datetime")
-        to = link_element[2].get_attribute("innerHTML").split('</span>')[1].strip()
-
-        link_element = item.find_elements(
-            By.XPATH, "./div[2]/div"
-        )
+    def get_last_page_number(self, tree):
+        """Return the highest ?page=N number referenced by the pagination links"""
+        page_numbers = []
+        for href in tree.xpath(
+            "//*[contains(@class, 'pagination-container')]//a/@href"
+            " | //a[@class='page-link']/@href"
+        ):
+            page = parse_qs(urlparse(href).query).get("page")
+            if page and page[0].isdigit():
+                page_numbers.append(int(page[0]))
+        return max(page_numbers) if page_numbers else 0
+
+    def get_page_url(self, url, page_number):
+        """Return the URL with its ?page= query parameter set to page_number"""
+        parts = urlparse(url)
+        query = parse_qs(parts.query)
+        query["page"] = [str(page_number)]
+        return urlunparse(parts._replace(query=urlencode(query, doseq=True)))
+
+    def extract_questions_from_page(self, tree):
+        """Extract all questions listed on a parsed page"""
+        questions = []
 
-        author = link_element[0].get_attribute("innerHTML").split('</span>')[1].strip()
+        # Unanswered questions are red, answered ones green
+        for selector, state in (
+            (".q-block3 .q-b3i-red", "no"),
+            (".q-block3 .q-b3i-green", "yes"),
+        ):
+            for row in extract_fields_from_tree(tree, selector, QUESTION_FIELDS):
+                if None in row.values():
+                    self.logger.error(f"Error extracting question info: {row}")
+                    continue
 
-        result = {"title": title, "to": to,"author" :author,"date":date,"state":state}
-        print(result)
+                questions.append(
+                    {
+                        "title": row["title"],
+                        "to": row["to"],
+                        "author": row["author"],
+                        "date": row["date"],
+                        "date_iso": normalize_date(row["date"]),
+                        "state": state,
+                    }
+                )
 
-        return result        
+        return questions
 
+    def scrape_question_pages(self, shard_index, page_numbers):
+        """Scrape a range of question pages, streaming them to their own file"""
+        filename = f"moroccan_questions_part_{page_numbers[0]}_{page_numbers[-1]}.jsonl"
+        sink = JsonlSink(filename)
 
-    def extract_question_info(self):
-        questions = []
-        current_page = 1
-        last_page = None
-
-        while True:
-            self.logger.info(f"Scraping page {current_page}")
-
-            # Wait for the law items to be present
-            try :
-                wait_for_element(self.driver, By.CSS_SELECTOR, ".q-block3 .q-b3i-red")
-            except :
-                pass
-            try :
-                wait_for_element(self.driver, By.CSS_SELECTOR, ".q-block3 .q-b3i-green")
-            except :
-                pass
-
-            # Find all law items
-            not_question_items = find_elements(
-                self.driver, By.CSS_SELECTOR, ".q-block3 .q-b3i-red"
-            )
+        try:
+            for page_number in page_numbers:
+                if self.journal is not None and self.journal.is_completed(
+                    "questions", page_number
+                ):
+                    for question in self.journal.get_records("questions", page_number):
+                        sink.write("questions", question)
+                    continue
 
-            yes_question_items = find_elements(
-                self.driver, By.CSS_SELECTOR, ".q-block3 .q-b3i-green"
-            )
+                self.logger.info(f"Shard {shard_index}: scraping page {page_number}")
 
-            for item in not_question_items:
-            
                 try:
-                    # Find the info within each item                
-                    result = self.extract_question_item(item,"no")
-                    questions.append(result)
-
-                except Exception as e:
-                    self.logger.error(f"Error extracting question info: {str(e)}")
-                    continue
+                    tree = self.fetch_page(
+                        self.get_page_url(self.base_url, page_number),
+                        page_type="question_listing",
+                    )
+                    page_questions = self.extract_questions_from_page(tree)
 
-            for item in yes_question_items:
-            
-                try:
-                    # Find the info within each item                
-                    result = self.extract_question_item(item,"yes")
-                    questions.append(result)
+                    for question in page_questions:
+                        sink.write("questions", question)
 
+                    if self.journal is not None:
+                        for question in page_questions:
+                            self.journal.add_record("questions", page_number, question)
+                        self.journal.complete_page("questions", page_number)
                 except Exception as e:
-                    self.logger.error(f"Error extracting law info: {str(e)}")
+                    self.logger.error(f"Error scraping page {page_number}: {str(e)}")
                     continue
+        finally:
+            sink.close()
+
+        return filename
+
+    def extract_question_info(self, num_shards=8):
+        """Scrape every question page, split into ranges handled in parallel"""
+        tree = self.fetch_page(self.base_url, page_type="question_listing")
+        last_page = self.get_last_page_number(tree)
+        self.logger.info(f"Found {last_page + 1} question pages")
+
+        # Pages are addressed directly as ?page=0 .. ?page=last_page
+        page_numbers = list(range(last_page + 1))
+        shard_size = -(-len(page_numbers) // num_shards)
+        shards = [
+            page_numbers[i : i + shard_size]
+            for i in range(0, len(page_numbers), shard_size)
+        ]
+
+        with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+            part_files = list(
+                executor.map(self.scrape_question_pages, range(len(shards)), shards)
+            )
 
-            try:
-                next_page_link = self.driver.find_element(
-                    By.XPATH, "//a[@class='page-link' and contains(text(), 'التالي')]"
-                )
-                if last_page is None:
-                    current_page_link = self.driver.find_element(
-                        By.CSS_SELECTOR, ".pagination-container .active a"
-                    )
-                    last_page = current_page_link.get_attribute("href")
-                next_page_link.click()
-                current_page += 1
-                self.wait_for_page_load()
-            except NoSuchElementException:
-                self.logger.info("No more pages to navigate.")
-                break
-            except Exception as e:
-                self.logger.error(f"Error navigating to the next page: {str(e)}")
-                break
-
-        return questions
+        # Part files are returned in page order, ready to be merged
+        return part_files
 
 
-    def scrape_question(self):
+    def scrape_question(
+        self, num_shards=8, resume=False, journal_file="moroccan_questions.journal.jsonl"
+    ):
 
         try:
             self.logger.info("Starting scraping process...")
+            self.journal = CheckpointJournal(journal_file, resume)
 
-            # Initialize driver if not already done
-            if self.driver is None:
-                self.driver = self.get_driver()
-
-            # Navigate to base URL
             self.logger.info(f"Accessing URL: {self.base_url}")
-            self.driver.get(self.base_url)
-            self.wait_for_page_load()
 
-            all_questions = {}
+            # Extract question information
+            part_files = self.extract_question_info(num_shards)
 
-            self.wait_for_page_load()
+            self.scheduler.log_report()
+            self.log_browser_stats()
 
-            # Extract law information
-            questions = self.extract_question_info()
+            if self.storage is not None:
+                self.storage.load_jsonl(part_files)
 
-            # Save to JSON
-            if questions:
-                self.save_to_json(
-                    {"questions": questions}, "moroccan_questions.json"
-                )
+            # Merge the page ranges into the final JSON file
+            return finalize_jsonl(part_files, "moroccan_questions.json")
 
         except Exception as e:
             self.logger.error(f"Error in scraping process: {str(e)}")
-            return []
+            return {}
         finally:
             self.cleanup()
 
@@ -0,0 +1,210 @@
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import time
+import unicodedata
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Spelling variants are folded to one form: alef with hamza or madda to
+# bare alef, alef maqsura to ya, ta marbuta to ha
+LETTER_MAP = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "\u0671": "ا", "ى": "ي", "ة": "ه"})
+DIACRITICS_PATTERN = re.compile(r"[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]")
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Status lines the listing prepends to law titles, e.g.
+# "صادق عليه مجلس النواب - القراءة 1"
+STATUS_LINE_PATTERN = re.compile(r"^[^\n]*القراءة\s*\d+\s*\n", re.MULTILINE)
+
+# Light stemming: the longest matching prefix and suffix are removed as long
+# as at least three letters remain
+PREFIXES = sorted(["وال", "بال", "كال", "فال", "لل", "ال", "و"], key=len, reverse=True)
+SUFFIXES = sorted(["ات", "ون", "ين", "ان", "ها", "يه", "ه", "ي"], key=len, reverse=True)
+MIN_STEM = 3
+
+
+def normalize_arabic(text):
+    """Fold the spelling variants of a text and drop its diacritics and tatweel"""
+    text = unicodedata.normalize("NFKC", text)
+    text = DIACRITICS_PATTERN.sub("", text).translate(LETTER_MAP)
+    return text.lower()
+
+
+def stem(token):
+    for prefix in PREFIXES:
+        if token.startswith(prefix) and len(token) - len(prefix) >= MIN_STEM:
+            token = token[len(prefix):]
+            break
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM:
+            token = token[: -len(suffix)]
+            break
+    return token
+
+
+def analyze(text):
+    """Return the normalized, stemmed terms of a text"""
+    text = STATUS_LINE_PATTERN.sub("", text or "")
+    return [stem(token) for token in TOKEN_PATTERN.findall(normalize_arabic(text))]
+
+
+def get_document(kind, record):
+    """Return (key, indexed text) of a law or a question"""
+    if kind == "law":
+        return record["url"], record.get("title") or ""
+    key = "|".join(record.get(field) or "" for field in ("title", "date", "author"))
+    return key, " ".join(record.get(field) or "" for field in ("title", "to"))
+
+
+class SearchIndex:
+    """Persistent full-text index of law titles and question subjects
+
+    Texts are analyzed in Python (normalize_arabic, then stem) and the terms
+    stored in an SQLite FTS5 table ranked with BM25. Records are keyed by
+    law url or question title, date and author; re-adding a record only
+    touches the index when its text changed, so new crawls can be added
+    incrementally.
+    """
+
+    def __init__(self, db_file="search_index.sqlite"):
+        self.db_file = db_file
+        self.connection = sqlite3.connect(db_file)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                record TEXT NOT NULL,
+                UNIQUE (kind, key)
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS terms USING fts5(tokens, tokenize = 'unicode61');
+            """
+        )
+
+    def add_records(self, kind, records):
+        """Index new or changed records in one transaction, return how many changed"""
+        changed = 0
+        with self.connection:
+            for record in records:
+                key, text = get_document(kind, record)
+                digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+                row = self.connection.execute(
+                    "SELECT id, digest FROM documents WHERE kind = ? AND key = ?", (kind, key)
+                ).fetchone()
+                record_json = json.dumps(record, ensure_ascii=False)
+
+                if row is not None and row[1] == digest:
+                    self.connection.execute(
+                        "UPDATE documents SET record = ? WHERE id = ?", (record_json, row[0])
+                    )
+                    continue
+
+                if row is None:
+                    doc_id = self.connection.execute(
+                        "INSERT INTO documents (kind, key, digest, record) VALUES (?, ?, ?, ?)",
+                        (kind, key, digest, record_json),
+                    ).lastrowid
+                else:
+                    doc_id = row[0]
+                    self.connection.execute(
+                        "UPDATE documents SET digest = ?, record = ? WHERE id = ?",
+                        (digest, record_json, doc_id),
+                    )
+                    self.connection.execute("DELETE FROM terms WHERE rowid = ?", (doc_id,))
+
+                self.connection.execute(
+                    "INSERT INTO terms (rowid, tokens) VALUES (?, ?)",
+                    (doc_id, " ".join(analyze(text))),
+                )
+                changed += 1
+        return changed
+
+    def add_file(self, filename):
+        """Index a legislation or questions output, or a JSONL stream of either"""
+        if filename.endswith(".jsonl"):
+            sections = {}
+            with open(filename, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        sections.setdefault(entry["category"], []).append(entry["record"])
+        else:
+            with open(filename, "r", encoding="utf-8") as f:
+                sections = json.load(f)
+
+        changed = 0
+        for category, records in sections.items():
+            kind = "question" if category == "questions" else "law"
+            changed += self.add_records(kind, records)
+        logger.info(f"Indexed {changed} new or changed records from {filename}")
+        return changed
+
+    def search(self, query, kind=None, limit=10, any_term=False):
+        """Return (score, record) pairs best first; every term must match unless any_term"""
+        terms = analyze(query)
+        if not terms:
+            return []
+        match = (" OR " if any_term else " ").join(f'"{term}"' for term in terms)
+
+        sql = (
+            "SELECT bm25(terms), documents.record FROM terms"
+            " JOIN documents ON documents.id = terms.rowid"
+            " WHERE terms MATCH ?"
+        )
+        params = [match]
+        if kind is not None:
+            sql += " AND documents.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY bm25(terms) LIMIT ?"
+        params.append(limit)
+
+        # FTS5 scores are negative, lower is better
+        return [
+            (-score, json.loads(record))
+            for score, record in self.connection.execute(sql, params)
+        ]
+
+    def close(self):
+        self.connection.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Full-text search over laws and questions")
+    parser.add_argument("--db", default="search_index.sqlite")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    index_parser = subparsers.add_parser("index", help="Add scraped outputs to the index")
+    index_parser.add_argument("files", nargs="+")
+
+    search_parser = subparsers.add_parser("search", help="Query the index")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--kind", choices=["law", "question"])
+    search_parser.add_argument("--limit", type=int, default=10)
+    search_parser.add_argument("--any", action="store_true", help="Match any term instead of all")
+    args = parser.parse_args()
+
+    index = SearchIndex(args.db)
+    try:
+        if args.action == "index":
+            for filename in args.files:
+                index.add_file(filename)
+        else:
+            start = time.perf_counter()
+            results = index.search(args.query, args.kind, args.limit, args.any)
+            elapsed = (time.perf_counter() - start) * 1000
+            for score, record in results:
+                # Titles can be multi-line, empty or missing; show their last line
+                title = "".join((record.get("title") or "").splitlines()[-1:])
+                print(f"{score:6.2f}  {title}")
+                print(f"        {record.get('url') or record.get('date')}")
+            print(f"{len(results)} results in {elapsed:.1f} ms")
+    finally:
+        index.close()
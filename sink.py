@@ -0,0 +1,84 @@
+import json
+import os
+import textwrap
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class JsonlSink:
+    """Appends records to a JSONL file as soon as they are extracted
+
+    Each line holds {"category": ..., "record": ...} so a single stream can
+    carry several output sections (e.g. projets_de_loi and textes_de_loi).
+    """
+
+    def __init__(self, filename, flush_every=20):
+        self.filename = filename
+        self.flush_every = flush_every
+        self.count = 0
+        self.lock = threading.Lock()
+        self.file = open(filename, "w", encoding="utf-8")
+
+    def write(self, category, record):
+        line = json.dumps({"category": category, "record": record}, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + "\n")
+            self.count += 1
+            if self.count % self.flush_every == 0:
+                self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+        logger.info(f"Wrote {self.count} records to {self.filename}")
+
+
+def iter_jsonl(filenames):
+    """Yield (category, record) pairs from one or more JSONL streams"""
+    for filename in filenames:
+        with open(filename, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    yield entry["category"], entry["record"]
+
+
+def finalize_jsonl(filenames, json_file):
+    """Build the nested {category: [records]} JSON layout from JSONL streams
+
+    Records are copied one at a time, with one pass per category, so memory
+    stays flat however large the streams are. The result is laid out exactly
+    like json.dump(..., indent=2).
+    """
+    categories = []
+    for category, _ in iter_jsonl(filenames):
+        if category not in categories:
+            categories.append(category)
+
+    temp_file = f"{json_file}.tmp"
+    counts = {}
+    with open(temp_file, "w", encoding="utf-8") as out:
+        out.write("{")
+        for i, category in enumerate(categories):
+            out.write(",\n" if i else "\n")
+            out.write(f"  {json.dumps(category, ensure_ascii=False)}: [")
+            counts[category] = 0
+            for record_category, record in iter_jsonl(filenames):
+                if record_category != category:
+                    continue
+                out.write(",\n" if counts[category] else "\n")
+                out.write(
+                    textwrap.indent(
+                        json.dumps(record, ensure_ascii=False, indent=2), "    "
+                    )
+                )
+                counts[category] += 1
+            out.write("\n  ]" if counts[category] else "]")
+        out.write("\n}" if categories else "}")
+    os.replace(temp_file, json_file)
+
+    logger.info(f"Data successfully saved to {json_file}")
+    return counts
@@ -0,0 +1,431 @@
+import argparse
+import json
+import os
+import sqlite3
+import textwrap
+import threading
+import logging
+
+from dates import fill_iso_date, normalize_dates
+
+logger = logging.getLogger(__name__)
+
+LAW_CATEGORIES = ("projets_de_loi", "propositions_de_loi", "textes_de_loi")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS laws (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT,
+    type TEXT,
+    date TEXT,
+    date_iso TEXT,
+    legislature_period TEXT,
+    commission TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (category, url)
+);
+CREATE INDEX IF NOT EXISTS laws_legislature_period ON laws (legislature_period);
+CREATE INDEX IF NOT EXISTS laws_commission ON laws (commission);
+
+CREATE TABLE IF NOT EXISTS readings (
+    id INTEGER PRIMARY KEY,
+    law_id INTEGER NOT NULL REFERENCES laws (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    reading TEXT,
+    deposit_date TEXT,
+    deposit_date_iso TEXT,
+    commission TEXT,
+    UNIQUE (law_id, position)
+);
+CREATE INDEX IF NOT EXISTS readings_commission ON readings (commission);
+
+CREATE TABLE IF NOT EXISTS votes (
+    reading_id INTEGER PRIMARY KEY REFERENCES readings (id) ON DELETE CASCADE,
+    yes INTEGER,
+    no INTEGER,
+    abstain INTEGER,
+    unanimous INTEGER,
+    approved INTEGER,
+    rejected INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    date TEXT NOT NULL,
+    date_iso TEXT,
+    author TEXT NOT NULL,
+    "to" TEXT,
+    state TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (title, date, author)
+);
+CREATE INDEX IF NOT EXISTS questions_to ON questions ("to");
+CREATE INDEX IF NOT EXISTS questions_author ON questions (author);
+
+CREATE TABLE IF NOT EXISTS deputies (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    term TEXT NOT NULL,
+    language TEXT NOT NULL,
+    party TEXT,
+    function TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (name, term, language)
+);
+CREATE INDEX IF NOT EXISTS deputies_party ON deputies (party);
+
+CREATE TABLE IF NOT EXISTS ministers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    government TEXT NOT NULL,
+    title TEXT NOT NULL,
+    party TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (name, government, title)
+);
+"""
+
+# ISO dates (see dates.py) are the columns date ranges are queried on; they
+# are added to databases created before them and indexed after that
+ISO_DATE_COLUMNS = {
+    "laws": ("date", "date_iso"),
+    "readings": ("deposit_date", "deposit_date_iso"),
+    "questions": ("date", "date_iso"),
+}
+
+ISO_DATE_INDEXES = """
+DROP INDEX IF EXISTS laws_date;
+DROP INDEX IF EXISTS questions_date;
+CREATE INDEX IF NOT EXISTS laws_date_iso ON laws (date_iso);
+CREATE INDEX IF NOT EXISTS readings_deposit_date_iso ON readings (deposit_date_iso);
+CREATE INDEX IF NOT EXISTS questions_date_iso ON questions (date_iso);
+"""
+
+# Columns of each table filled from a record, natural key first. Key
+# columns hold "" rather than NULL, since NULLs never conflict in SQLite.
+TABLES = {
+    "laws": (("category", "url"), ("title", "type", "date", "date_iso", "legislature_period", "commission")),
+    "questions": (("title", "date", "author"), ("date_iso", "to", "state")),
+    "deputies": (("name", "term", "language"), ("party", "function")),
+    "ministers": (("name", "government", "title"), ("party",)),
+}
+
+VOTE_FIELDS = ("yes", "no", "abstain", "unanimous", "approved", "rejected")
+
+
+def get_table(category):
+    """Return the table records of a sink category are stored in"""
+    if category in LAW_CATEGORIES:
+        return "laws"
+    if category in ("parliamentarians", "deputies"):
+        return "deputies"
+    if category in TABLES:
+        return category
+    raise ValueError(f"No table for category {category}")
+
+
+def get_row(table, category, record):
+    """Return the column values of a record, in the order of TABLES"""
+    key_columns, columns = TABLES[table]
+    values = dict(record)
+    if table in ("laws", "questions"):
+        values["date_iso"] = fill_iso_date(record.get("date_iso"), record.get("date"))
+    if table == "laws":
+        values["category"] = category
+    elif table == "ministers":
+        # Ministers delegated to a department are listed with the minister
+        # they report to instead of a title
+        values["title"] = record.get("title") or record.get("ministre_de_rattachement")
+    return (
+        *(values.get(column) or "" for column in key_columns),
+        *(values.get(column) for column in columns),
+        json.dumps(record, ensure_ascii=False),
+    )
+
+
+def quote(column):
+    return f'"{column}"'
+
+
+class Storage:
+    """SQLite store shared by the scrapers
+
+    Records are written with write(category, record), like JsonlSink, and
+    upserted on their natural key in batched transactions: a law by its
+    category and url (a bill can also be listed as an adopted text), a
+    question by title, date and author, a deputy by name, term and language
+    and a minister by name, government and title. Each row keeps the full
+    record so the JSON layouts can be exported unchanged; law readings and
+    their votes are also split into their own tables for querying.
+    """
+
+    def __init__(self, db_file="moroccan_parliament.sqlite", batch_size=500):
+        self.db_file = db_file
+        self.batch_size = batch_size
+        self.pending = {table: [] for table in TABLES}
+        self.count = 0
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_file, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+        self.add_iso_date_columns()
+        self.connection.executescript(ISO_DATE_INDEXES)
+
+    def add_iso_date_columns(self):
+        """Add and fill the ISO date columns of a database created before them"""
+        with self.connection:
+            for table, (column, iso_column) in ISO_DATE_COLUMNS.items():
+                existing = [row[1] for row in self.connection.execute(f"PRAGMA table_info({table})")]
+                if iso_column in existing:
+                    continue
+                self.connection.execute(f"ALTER TABLE {table} ADD COLUMN {iso_column} TEXT")
+                rows = self.connection.execute(f"SELECT id, {column} FROM {table}").fetchall()
+                iso_dates = normalize_dates([value for _, value in rows])
+                self.connection.executemany(
+                    f"UPDATE {table} SET {iso_column} = ? WHERE id = ?",
+                    [(iso, row_id) for (row_id, _), iso in zip(rows, iso_dates)],
+                )
+                logger.info(f"Added {table}.{iso_column} to {self.db_file}")
+
+    def write(self, category, record):
+        """Queue a record, flushing its table once a batch is full"""
+        table = get_table(category)
+        with self.lock:
+            self.pending[table].append((category, record))
+            if len(self.pending[table]) >= self.batch_size:
+                self.flush_table(table)
+
+    def flush(self):
+        with self.lock:
+            for table in TABLES:
+                self.flush_table(table)
+
+    def flush_table(self, table):
+        """Upsert the queued records of a table in one transaction"""
+        records = self.pending[table]
+        if not records:
+            return
+        self.pending[table] = []
+
+        # Parse the batch's distinct dates at once, get_row then hits the memo
+        normalize_dates([record.get("date") for _, record in records])
+        normalize_dates(
+            [r.get("deposit_date") for _, record in records for r in record.get("readings") or []]
+        )
+
+        key_columns, columns = TABLES[table]
+        all_columns = (*key_columns, *columns, "data")
+        statement = (
+            f"INSERT INTO {table} ({', '.join(map(quote, all_columns))})"
+            f" VALUES ({', '.join('?' * len(all_columns))})"
+            f" ON CONFLICT ({', '.join(map(quote, key_columns))}) DO UPDATE SET "
+            + ", ".join(f"{quote(c)} = excluded.{quote(c)}" for c in (*columns, "data"))
+        )
+
+        with self.connection:
+            if table != "laws":
+                self.connection.executemany(
+                    statement, [get_row(table, category, record) for category, record in records]
+                )
+            else:
+                for category, record in records:
+                    law_id = self.connection.execute(
+                        statement + " RETURNING id", get_row(table, category, record)
+                    ).fetchone()[0]
+                    self.store_readings(law_id, record.get("readings") or [])
+        self.count += len(records)
+
+    def store_readings(self, law_id, readings):
+        """Replace the readings and votes of a law"""
+        self.connection.execute("DELETE FROM readings WHERE law_id = ?", (law_id,))
+        for position, reading in enumerate(readings):
+            reading_id = self.connection.execute(
+                "INSERT INTO readings"
+                " (law_id, position, reading, deposit_date, deposit_date_iso, commission)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    law_id,
+                    position,
+                    reading.get("reading"),
+                    reading.get("deposit_date"),
+                    fill_iso_date(reading.get("deposit_date_iso"), reading.get("deposit_date")),
+                    reading.get("commission"),
+                ),
+            ).lastrowid
+            vote = reading.get("vote")
+            if vote:
+                self.connection.execute(
+                    f"INSERT INTO votes (reading_id, {', '.join(VOTE_FIELDS)})"
+                    f" VALUES (?{', ?' * len(VOTE_FIELDS)})",
+                    (reading_id, *(vote.get(field) for field in VOTE_FIELDS)),
+                )
+
+    def load_jsonl(self, filenames):
+        """Store every record of JSONL streams written by JsonlSink"""
+        for filename in filenames:
+            with open(filename, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.write(entry["category"], entry["record"])
+        self.flush()
+
+    def load_json(self, filename, category=None):
+        """Store the records of a {category: [records]} file, or of a list of records"""
+        with open(filename, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get("parliamentarians"), list):
+            # Term files written by the deputies scraper
+            data = {category or "deputies": data["parliamentarians"]}
+        elif isinstance(data, list):
+            data = {category: data}
+        for data_category, records in data.items():
+            for record in records:
+                self.write(data_category, record)
+        self.flush()
+
+    def query(self, sql, params=()):
+        with self.lock:
+            return self.connection.execute(sql, params).fetchall()
+
+    def find_laws(self, legislature_period=None, commission=None, category=None, date_from=None, date_to=None):
+        """Return the laws matching every given field, through the indexes
+
+        date_from and date_to are ISO dates (YYYY-MM-DD) compared to date_iso.
+        """
+        filters = {
+            "legislature_period": legislature_period,
+            "commission": commission,
+            "category": category,
+        }
+        ranges = {"date_iso": (date_from, date_to)}
+        return self.find("laws", filters, ranges)
+
+    def find_questions(self, to=None, author=None, date_from=None, date_to=None):
+        """Return the questions matching every given field, through the indexes
+
+        date_from and date_to are ISO dates (YYYY-MM-DD) compared to date_iso.
+        """
+        filters = {"to": to, "author": author}
+        ranges = {"date_iso": (date_from, date_to)}
+        return self.find("questions", filters, ranges)
+
+    def find(self, table, filters, ranges=None):
+        conditions = []
+        params = []
+        for column, value in filters.items():
+            if value is not None:
+                conditions.append(f"{quote(column)} = ?")
+                params.append(value)
+        for column, (low, high) in (ranges or {}).items():
+            if low is not None:
+                conditions.append(f"{quote(column)} >= ?")
+                params.append(low)
+            if high is not None:
+                conditions.append(f"{quote(column)} <= ?")
+                params.append(high)
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.query(f"SELECT data FROM {table}{where} ORDER BY id", params)
+        return [json.loads(data) for (data,) in rows]
+
+    def iter_records(self, table):
+        """Yield (category, record) pairs of a table in insertion order"""
+        self.flush()
+        category_column = "category" if table == "laws" else "NULL"
+        cursor = self.connection.cursor()
+        for category, data in cursor.execute(
+            f"SELECT {category_column}, data FROM {table} ORDER BY id"
+        ):
+            yield category, json.loads(data)
+
+    def export_json(self, json_file, table):
+        """Write a table back to its JSON layout
+
+        Laws are exported as {category: [laws]}, questions as
+        {"questions": [questions]}, deputies and ministers as a list, all laid
+        out like json.dump(..., indent=2).
+        """
+        if table == "laws":
+            rows = self.query("SELECT category FROM laws GROUP BY category ORDER BY MIN(id)")
+            categories = [category for (category,) in rows]
+        elif table == "questions":
+            categories = ["questions"]
+        else:
+            categories = [None]
+
+        temp_file = f"{json_file}.tmp"
+        count = 0
+        with open(temp_file, "w", encoding="utf-8") as out:
+            if categories == [None]:
+                count = self.write_array(out, (r for _, r in self.iter_records(table)), "  ")
+                out.write("\n")
+            else:
+                out.write("{")
+                for i, category in enumerate(categories):
+                    out.write(",\n" if i else "\n")
+                    out.write(f"  {json.dumps(category, ensure_ascii=False)}: ")
+                    records = (
+                        record
+                        for record_category, record in self.iter_records(table)
+                        if table != "laws" or record_category == category
+                    )
+                    count += self.write_array(out, records, "    ", closing_indent="  ")
+                out.write("\n}" if categories else "}")
+        os.replace(temp_file, json_file)
+
+        logger.info(f"Exported {count} {table} to {json_file}")
+        return count
+
+    def write_array(self, out, records, indent, closing_indent=""):
+        out.write("[")
+        count = 0
+        for record in records:
+            out.write(",\n" if count else "\n")
+            out.write(textwrap.indent(json.dumps(record, ensure_ascii=False, indent=2), indent))
+            count += 1
+        out.write(f"\n{closing_indent}]" if count else "]")
+        return count
+
+    def close(self):
+        self.flush()
+        with self.lock:
+            self.connection.close()
+        logger.info(f"Stored {self.count} records in {self.db_file}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Load scraped data into SQLite or export it back to JSON")
+    parser.add_argument("--db", default="moroccan_parliament.sqlite")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    load_parser = subparsers.add_parser("load", help="Store JSON or JSONL outputs")
+    load_parser.add_argument("files", nargs="+")
+    load_parser.add_argument(
+        "--category", help="Category of the records of a plain JSON list, e.g. deputies or ministers"
+    )
+
+    export_parser = subparsers.add_parser("export", help="Export a table to its JSON layout")
+    export_parser.add_argument("table", choices=list(TABLES))
+    export_parser.add_argument("json_file")
+    args = parser.parse_args()
+
+    storage = Storage(args.db)
+    try:
+        if args.action == "load":
+            for filename in args.files:
+                if filename.endswith(".jsonl"):
+                    storage.load_jsonl([filename])
+                else:
+                    storage.load_json(filename, args.category)
+        else:
+            storage.export_json(args.json_file, args.table)
+    finally:
+        storage.close()
@@ -1,15 +1,51 @@
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 import logging
 
 logger = logging.getLogger(__name__)
 
+# How often readiness conditions are checked, in seconds
+POLL_INTERVAL = 0.1
+
+# What "ready" means for each kind of page: any one of the selectors is
+# present, then optionally no DOM mutation for stable_ms milliseconds
+READINESS_PROFILES = {
+    "home": {"selectors": [".dropdown-menu.multi-column.columns-3"], "stable_ms": 0},
+    "law_listing": {
+        "selectors": [".col-md-6.col-lg-4.mb-4", ".view-empty"],
+        "stable_ms": 0,
+    },
+    "law_detail": {"selectors": [".dp-section", ".view-empty"], "stable_ms": 200},
+    "question_listing": {
+        "selectors": [".q-block3 .q-b3i-red", ".q-block3 .q-b3i-green", ".view-empty"],
+        "stable_ms": 0,
+    },
+    "directory": {"selectors": ["div.filter-result-wrp"], "stable_ms": 200},
+}
+
+# Resolves once the document has gone quiet_ms without any DOM mutation
+STABLE_DOM_SCRIPT = """
+const [quietMs, done] = [arguments[0], arguments[arguments.length - 1]];
+let timer = setTimeout(finish, quietMs);
+const observer = new MutationObserver(() => {
+    clearTimeout(timer);
+    timer = setTimeout(finish, quietMs);
+});
+function finish() {
+    observer.disconnect();
+    done(true);
+}
+observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+"""
+
 
 def wait_for_element(driver, by, value, timeout=20):
     """Wait for an element to be present"""
     try:
-        WebDriverWait(driver, timeout).until(
+        WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(
             EC.presence_of_element_located((by, value))
         )
     except Exception as e:
@@ -17,6 +53,36 @@ def wait_for_element(driver, by, value, timeout=20):
         raise
 
 
+def wait_for_any(driver, selectors, timeout=20):
+    """Wait until any of the CSS selectors matches and return the one that did"""
+    script = "return arguments[0].find(s => document.querySelector(s) !== null) || null;"
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(
+            lambda d: d.execute_script(script, selectors)
+        )
+    except TimeoutException:
+        logger.error(f"None of {selectors} appeared within {timeout}s")
+        raise
+
+
+def wait_for_stable_dom(driver, quiet_ms=300, timeout=10):
+    """Wait until the DOM has stopped changing for quiet_ms milliseconds"""
+    driver.set_script_timeout(timeout)
+    try:
+        driver.execute_async_script(STABLE_DOM_SCRIPT, quiet_ms)
+    except TimeoutException:
+        logger.warning(f"DOM still changing after {timeout}s, continuing")
+
+
+def wait_until_ready(driver, page_type, timeout=20):
+    """Wait for a page according to its readiness profile"""
+    profile = READINESS_PROFILES[page_type]
+    matched = wait_for_any(driver, profile["selectors"], timeout)
+    if profile["stable_ms"]:
+        wait_for_stable_dom(driver, profile["stable_ms"], timeout)
+    return matched
+
+
 def find_elements(driver, by, value):
     """Find elements by a given locator"""
     try:
@@ -34,3 +100,203 @@ def click_element(driver, by, value):
     except Exception as e:
         logger.error(f"Error clicking element {by}={value}: {str(e)}")
         raise
+
+
+def select_one(element, selector):
+    """Return the first element matching a CSS selector, or None"""
+    matches = element.cssselect(selector)
+    return matches[0] if matches else None
+
+
+def element_text(element):
+    """Return the visible text of a parsed element with whitespace collapsed"""
+    if element is None:
+        return ""
+    return clean_text(element.text_content())
+
+
+# Runs in the browser: reads every field of every card in a single round trip
+EXTRACT_FIELDS_SCRIPT = """
+const [containerSelector, fields] = arguments;
+const lookup = (card, spec) => {
+    if (spec.xpath) {
+        return document.evaluate(
+            spec.xpath, card, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+    }
+    return spec.css ? card.querySelector(spec.css) : card;
+};
+const read = (el, attr) => {
+    if (attr === "text") return el.innerText;
+    if (attr === "tail") {
+        const next = el.nextSibling;
+        return next && next.nodeType === Node.TEXT_NODE ? next.textContent : "";
+    }
+    return typeof el[attr] === "string" ? el[attr] : el.getAttribute(attr);
+};
+return Array.from(document.querySelectorAll(containerSelector)).map(card => {
+    const row = {};
+    for (const [name, spec] of Object.entries(fields)) {
+        const el = lookup(card, spec);
+        row[name] = el ? read(el, spec.attr || "text") : null;
+    }
+    return row;
+});
+"""
+
+
+def clean_text(text):
+    """Collapse whitespace within lines and drop empty lines"""
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def clean_fields(rows, fields):
+    """Normalize the text fields of extracted rows"""
+    for row in rows:
+        for name, spec in fields.items():
+            if row[name] is not None and spec.get("attr", "text") in ("text", "tail"):
+                row[name] = clean_text(row[name])
+    return rows
+
+
+def extract_fields(driver, container_selector, fields):
+    """Extract fields for every card on the page with one execute_script call
+
+    fields maps each output name to a spec: {"css": selector} or
+    {"xpath": relative_xpath} locating the element inside the card (the card
+    itself when both are omitted), and "attr" naming what to read: "text",
+    "tail" (text right after the element) or any attribute/property. Missing
+    elements yield None.
+    """
+    try:
+        rows = driver.execute_script(EXTRACT_FIELDS_SCRIPT, container_selector, fields)
+    except Exception as e:
+        logger.error(f"Error extracting fields from {container_selector}: {str(e)}")
+        raise
+    return clean_fields(rows, fields)
+
+
+def extract_fields_from_tree(tree, container_selector, fields):
+    """Same as extract_fields, on an lxml tree parsed from the page HTML"""
+    rows = []
+    for card in tree.cssselect(container_selector):
+        row = {}
+        for name, spec in fields.items():
+            if spec.get("xpath"):
+                matches = card.xpath(spec["xpath"])
+                element = matches[0] if matches else None
+            elif spec.get("css"):
+                element = select_one(card, spec["css"])
+            else:
+                element = card
+
+            attr = spec.get("attr", "text")
+            if element is None:
+                row[name] = None
+            elif attr == "text":
+                row[name] = element.text_content()
+            elif attr == "tail":
+                row[name] = element.tail or ""
+            else:
+                row[name] = element.get(attr)
+        rows.append(row)
+    return clean_fields(rows, fields)
+
+
+# Resources the scrapers never read: media, fonts, styles and third-party trackers.
+# Network.setBlockedURLs only matches URLs, so stylesheets, fonts or images
+# served from extension-less URLs still load; measure_blocking_savings shows
+# what the patterns actually save on a given page
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.css", "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*facebook.com*", "*twitter.com*", "*youtube.com*",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*", "*addthis.com*",
+]
+
+# Bytes transferred and load time of the current page, from the Resource Timing API
+PAGE_STATS_SCRIPT = """
+const nav = performance.getEntriesByType("navigation")[0];
+const resources = performance.getEntriesByType("resource");
+const bytes = resources.reduce((sum, r) => sum + (r.transferSize || 0), 0)
+    + (nav ? nav.transferSize || 0 : 0);
+return {
+    transfer_bytes: bytes,
+    resources: resources.length,
+    load_ms: nav ? Math.round(nav.duration) : null
+};
+"""
+
+
+def add_lean_options(options, user_data_dir):
+    """Configure a headless, extension-free profile that reuses a warm data dir"""
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--disable-default-apps")
+    options.add_argument("--disable-sync")
+    options.add_argument("--mute-audio")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument(f"--user-data-dir={user_data_dir}")
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def enable_resource_blocking(driver, patterns=LEAN_BLOCKED_URLS):
+    """Block URLs matching the patterns, by extension or domain, through CDP"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        logger.error(f"Error enabling resource blocking: {str(e)}")
+        raise
+
+
+def get_page_stats(driver):
+    """Return transfer size, resource count, load time and blocked requests of the page"""
+    stats = driver.execute_script(PAGE_STATS_SCRIPT)
+    stats["blocked"] = 0
+    try:
+        # Each read drains the log, so this only counts the current page
+        for entry in driver.get_log("performance"):
+            if '"Network.loadingFailed"' in entry["message"] and "blockedReason" in entry["message"]:
+                stats["blocked"] += 1
+    except Exception:
+        pass
+    return stats
+
+
+def measure_blocking_savings(driver, url, patterns=LEAN_BLOCKED_URLS):
+    """Load a page without and then with resource blocking and return both stats
+
+    The browser cache is disabled for both loads so the blocked run does not
+    benefit from what the baseline run downloaded. Blocking is left enabled.
+    """
+    driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": True})
+    try:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+        driver.get(url)
+        baseline = get_page_stats(driver)
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        driver.get(url)
+        blocked = get_page_stats(driver)
+    finally:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        driver.execute_cdp_cmd("Network.setCacheDisabled", {"cacheDisabled": False})
+    return baseline, blocked
+
+
+def format_blocking_savings(baseline, blocked):
+    """Describe the bytes and load time saved by resource blocking"""
+    saved = baseline["transfer_bytes"] - blocked["transfer_bytes"]
+    share = saved / baseline["transfer_bytes"] if baseline["transfer_bytes"] else 0
+    return (
+        f"{baseline['transfer_bytes'] / 1024:.0f} KB and {baseline['resources']} resources "
+        f"in {baseline['load_ms']} ms unblocked, "
+        f"{blocked['transfer_bytes'] / 1024:.0f} KB and {blocked['resources']} resources "
+        f"in {blocked['load_ms']} ms blocked ({share:.0%} of the bytes saved, "
+        f"{blocked['blocked']} requests blocked)"
+    )